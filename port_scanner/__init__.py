@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Scanner de Ports & Services Intelligent
+Scanne les ports TCP, identifie les services et détecte les risques de sécurité
+
+L'import du paquet est sans effet de bord (aucun handler de logging, aucune
+modification de sys.path) et ne charge les sous-modules qu'au premier accès :
+
+    from port_scanner import PortScanner, RiskAnalyzer
+"""
+
+__version__ = '1.1.0'
+
+# Nom public -> module qui le définit, chargé à la demande
+_LAZY_ATTRIBUTES = {
+    'PortScanner': 'scanner',
+    'MultiHostScanner': 'scanner',
+    'RiskAnalyzer': 'analysis',
+    'ReportGenerator': 'report',
+    'PostProcessor': 'postprocess',
+    'AnalysisPlugin': 'postprocess',
+    'main': 'cli',
+}
+
+__all__ = ['PortScanner', 'MultiHostScanner', 'RiskAnalyzer', 'ReportGenerator', 'PostProcessor',
+           'AnalysisPlugin', 'main', '__version__']
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Import relatif via __import__ : évite de charger importlib
+    module = __import__(module_name, globals(), None, [name], 1)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
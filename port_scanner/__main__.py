@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Point d'entrée pour `python -m port_scanner`
+"""
+
+from .cli import main
+
+if __name__ == '__main__':
+    main()
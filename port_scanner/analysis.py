@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analyse des risques de sécurité des ports ouverts
+"""
+
+from typing import Dict
+
+from .config import SENSITIVE_PORTS
+from .utils.colors import Colors
+
+class RiskAnalyzer:
+    def __init__(self, scan_results: Dict):
+        self.target = scan_results['target']
+        self.open_ports = scan_results['open_ports']
+        self.services = scan_results['services']
+        self.risks = {
+            'CRITICAL': [],
+            'HIGH': [],
+            'MEDIUM': [],
+            'LOW': []
+        }
+    
+    def analyze(self) -> Dict:
+        """Analyse les risques de sécurité"""
+        for port in self.open_ports:
+            service_info = self.services.get(port, {})
+            service_name = service_info.get('name', 'Unknown')
+            
+            if port in SENSITIVE_PORTS:
+                risk_info = SENSITIVE_PORTS[port]
+                risk_level = risk_info['risk']
+                
+                self.risks[risk_level].append({
+                    'port': port,
+                    'service': service_name,
+                    'description': risk_info['description'],
+                    'banner': service_info.get('banner')
+                })
+            elif port < 1024:  # Ports privilégiés
+                self.risks['LOW'].append({
+                    'port': port,
+                    'service': service_name,
+                    'description': f'Port système ({service_name}) - Vérifier la configuration',
+                    'banner': service_info.get('banner')
+                })
+            else:
+                self.risks['LOW'].append({
+                    'port': port,
+                    'service': service_name,
+                    'description': f'Service {service_name} détecté - Vérifier la configuration',
+                    'banner': service_info.get('banner')
+                })
+        
+        return self.risks
+    
+    def get_summary(self) -> str:
+        """Génère un résumé des risques"""
+        summary = []
+        
+        total_critical = len(self.risks['CRITICAL'])
+        total_high = len(self.risks['HIGH'])
+        total_medium = len(self.risks['MEDIUM'])
+        total_low = len(self.risks['LOW'])
+        
+        summary.append(f"\n{Colors.BOLD}{'='*70}{Colors.RESET}")
+        summary.append(f"{Colors.BOLD}RÉSUMÉ DES RISQUES DE SÉCURITÉ{Colors.RESET}")
+        summary.append(f"{Colors.BOLD}{'='*70}{Colors.RESET}\n")
+        
+        summary.append(f"{Colors.RED}CRITIQUE: {total_critical}{Colors.RESET}")
+        summary.append(f"{Colors.YELLOW}ÉLEVÉ:    {total_high}{Colors.RESET}")
+        summary.append(f"{Colors.BLUE}MOYEN:    {total_medium}{Colors.RESET}")
+        summary.append(f"{Colors.GREEN}FAIBLE:   {total_low}{Colors.RESET}")
+        summary.append(f"{Colors.CYAN}TOTAL:    {len(self.open_ports)} ports ouverts{Colors.RESET}\n")
+        
+        return '\n'.join(summary)
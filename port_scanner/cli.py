@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interface en ligne de commande du Scanner de Ports & Services Intelligent
+
+Les modes optionnels (démon, distribué, surveillance) ne sont importés que
+lorsqu'ils sont demandés.
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple
+
+from .config import (SERVICES_COMMON, SENSITIVE_PORTS, SCANNER_CONFIG, LOGGING_CONFIG, DAEMON_CONFIG,
+                     DISTRIBUTED_CONFIG, WATCH_CONFIG)
+from .scanner import PortScanner, MultiHostScanner, bounded_threads, create_socket_transport
+from .utils.colors import Colors
+from .utils.logger import setup_logger
+from .utils.transport import Transport, PORT_OPEN, PORT_CLOSED, PORT_FILTERED
+from .utils.validators import validate_target, validate_port_range, validate_ports, ValidationError
+
+if TYPE_CHECKING:
+    from .postprocess import PostProcessor
+    from .utils.daemon import ScanDaemon, ScanJob
+
+logger = logging.getLogger('port_scanner')
+
+def parse_ports(port_string: str) -> List[int]:
+    """Parse une chaîne de ports (ex: '80,443,8000-8010')"""
+    try:
+        return validate_port_range(port_string)
+    except ValidationError as e:
+        logger.error(f"Erreur de validation des ports: {e}")
+        raise
+
+def parse_address(address: str, default_host: str, default_port: int) -> Tuple[str, int]:
+    """Parse une adresse 'hôte:port' (chaque partie est optionnelle)"""
+    if not address:
+        return default_host, default_port
+    host, _, port = address.rpartition(':')
+    return host or default_host, int(port) if port else default_port
+
+def create_daemon_runner() -> Callable[['ScanJob', 'ScanDaemon'], Dict]:
+    """Crée la fonction d'exécution des jobs du démon (transport partagé entre jobs)"""
+    from .analysis import RiskAnalyzer
+    
+    transport = create_socket_transport()
+    
+    def run_job(job: 'ScanJob', daemon: 'ScanDaemon') -> Dict:
+        params = job.params
+        target = params['target']
+        
+        # Résolution DNS mise en cache entre les jobs
+        target_ip = daemon.dns_cache.get(target)
+        if target_ip is None:
+            target_ip = validate_target(target)
+            daemon.dns_cache.set(target, target_ip)
+        
+        if params.get('fast'):
+            ports = list(SERVICES_COMMON.keys())
+        elif isinstance(params.get('ports'), str):
+            ports = parse_ports(params['ports'])
+        elif params.get('ports'):
+            ports = validate_ports(params['ports'])
+        else:
+            ports = None
+        
+        # Un job attend son banner le plus lent et ses tours de retransmission :
+        # délais courts par défaut, ajustables par job
+        banner_timeout = float(params.get('banner_timeout', DAEMON_CONFIG.get('banner_timeout', 0.3)))
+        retry_delay = float(params.get('retry_delay', DAEMON_CONFIG.get('retry_delay', 0.05)))
+        
+        # Réutilise un résultat récent pour la même cible et les mêmes ports
+        cache_key = (target_ip, tuple(ports) if ports else None, params.get('timeout'), banner_timeout)
+        max_age = float(params.get('max_age', DAEMON_CONFIG.get('result_max_age', 30.0)))
+        cached = daemon.result_cache.get(cache_key, max_age=max_age) if max_age > 0 else None
+        if cached is not None:
+            job.emit('cached')
+            for port in cached['open_ports']:
+                job.emit('open', port=port, **cached['services'][port])
+            return cached
+        
+        scanner = PortScanner(
+            target=target_ip,
+            ports=ports,
+            threads=bounded_threads(params.get('threads'), ports),
+            timeout=params.get('timeout'),
+            transport=transport,
+            on_open=lambda port, info: job.emit('open', port=port, **info),
+            verbose=False,
+            banner_timeout=banner_timeout,
+            retry_delay=retry_delay
+        )
+        results = scanner.scan()
+        results['risks'] = RiskAnalyzer(results).analyze()
+        daemon.result_cache.set(cache_key, results)
+        return results
+    
+    return run_job
+
+def run_daemon(listen: str = None, unix_socket: str = None):
+    """Lance le démon de scan et son API locale"""
+    from .utils.daemon import ScanDaemon, serve_daemon
+    
+    host, port = parse_address(listen, DAEMON_CONFIG.get('host', '127.0.0.1'), DAEMON_CONFIG.get('port', 8765))
+    
+    daemon = ScanDaemon(
+        create_daemon_runner(),
+        workers=DAEMON_CONFIG.get('workers', 2),
+        dns_ttl=DAEMON_CONFIG.get('dns_ttl', 300.0),
+        result_ttl=DAEMON_CONFIG.get('result_ttl', 3600.0),
+        history=DAEMON_CONFIG.get('history', 256)
+    )
+    print(f"{Colors.CYAN}[*] Démon de scan démarré sur {unix_socket or f'{host}:{port}'}{Colors.RESET}")
+    # SIGTERM passe par les blocs finally (fermeture du socket Unix, arrêt des workers)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        serve_daemon(daemon, host=host, port=port, unix_socket=unix_socket)
+    except OSError as e:
+        logger.error(f"Impossible de démarrer le démon: {e}")
+        print(f"{Colors.RED}[!] Erreur: {e}{Colors.RESET}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}[!] Démon arrêté{Colors.RESET}")
+
+def create_chunk_scanner(transport: Transport = None) -> Callable[..., Dict]:
+    """Crée la fonction de scan des lots d'un worker (transport partagé entre lots)"""
+    transport = transport if transport else create_socket_transport()
+    
+    def scan_chunk(host: str, ports: List[int], timeout: float, threads: int,
+                   on_open: Callable[[int, Dict], None]) -> Dict:
+        scanner = PortScanner(host, ports=ports, threads=bounded_threads(threads, ports), timeout=timeout,
+                              transport=transport, on_open=on_open, verbose=False)
+        results = scanner.scan()
+        return {key: results[key] for key in ('open_ports', 'services', 'filtered_ports', 'unresolved_ports')}
+    
+    return scan_chunk
+
+def run_distributed(targets: List[str], ports: List[int], threads: int, timeout: float,
+                    listen: str = None) -> Dict[str, Dict]:
+    """Coordonne un scan réparti sur des workers et retourne les résultats par hôte"""
+    from .utils.distributed import Coordinator, run_coordinator
+    
+    host, port = parse_address(listen, DISTRIBUTED_CONFIG.get('host', '127.0.0.1'),
+                               DISTRIBUTED_CONFIG.get('port', 8766))
+    addresses = []
+    for target in targets:
+        address = validate_target(target)
+        if address not in addresses:
+            addresses.append(address)
+    
+    def report_open(target: str, open_port: int, info: Dict):
+        print(f"{Colors.GREEN}[+] {target}:{open_port} ouvert ({info.get('name')}){Colors.RESET}")
+    
+    coordinator = Coordinator(
+        addresses,
+        ports or SCANNER_CONFIG.get('default_ports', list(range(1, 1001))),
+        chunk_size=DISTRIBUTED_CONFIG.get('chunk_size', 256),
+        timeout=timeout,
+        threads=threads,
+        lease_timeout=DISTRIBUTED_CONFIG.get('lease_timeout', 30.0),
+        on_open=report_open,
+        lease_max_duration=DISTRIBUTED_CONFIG.get('lease_max_duration', 600.0),
+        max_attempts=DISTRIBUTED_CONFIG.get('chunk_max_attempts', 3)
+    )
+    print(f"{Colors.CYAN}[*] Coordinateur sur {host}:{port} - {len(addresses)} hôte(s), "
+          f"{coordinator.total_chunks} lots{Colors.RESET}")
+    print(f"{Colors.CYAN}[*] En attente de workers (--worker {host}:{port}){Colors.RESET}\n")
+    return run_coordinator(coordinator, host, port)
+
+def print_change(event: Dict):
+    """Affiche un changement d'état détecté par la surveillance"""
+    color = {
+        'CRITICAL': Colors.RED,
+        'HIGH': Colors.YELLOW,
+        'MEDIUM': Colors.BLUE
+    }.get(event.get('risk'), Colors.GREEN)
+    timestamp = datetime.fromtimestamp(event['time']).strftime('%Y-%m-%d %H:%M:%S')
+    old = event['old'] or 'nouveau'
+    service = event.get('name') or SERVICES_COMMON.get(event['port'], 'Unknown')
+    print(f"{Colors.DIM}{timestamp}{Colors.RESET} {color}[{event.get('risk') or 'INFO'}]{Colors.RESET} "
+          f"{Colors.CYAN}{event['host']}:{event['port']}{Colors.RESET} ({service}) {old} -> {Colors.BOLD}{event['new']}{Colors.RESET}")
+    logger.info(f"Changement: {event['host']}:{event['port']} {old} -> {event['new']}")
+
+def run_watch(targets: List[str], ports: List[int], threads: int, timeout: float,
+              interval: float = None, budget: int = None):
+    """Rescanne les cibles en continu et n'affiche que les changements d'état"""
+    from .utils.monitor import WatchScheduler
+    from .utils.retry import RetryScheduler
+    
+    interval = interval or WATCH_CONFIG.get('interval', 10.0)
+    budget = budget or WATCH_CONFIG.get('budget', 500)
+    ports = ports or SCANNER_CONFIG.get('default_ports', list(range(1, 1001)))
+    addresses = []
+    for target in targets:
+        address = validate_target(target)
+        if address not in addresses:
+            addresses.append(address)
+    
+    scheduler = WatchScheduler(
+        addresses,
+        ports,
+        budget,
+        port_risks={port: info['risk'] for port, info in SENSITIVE_PORTS.items()},
+        open_weight=WATCH_CONFIG.get('open_weight', 2.0),
+        change_boost=WATCH_CONFIG.get('change_boost', 4.0),
+        change_window=WATCH_CONFIG.get('change_window', 600.0),
+        rescan_share=WATCH_CONFIG.get('rescan_share', 0.5)
+    )
+    transport = create_socket_transport()
+    # Les ports filtrés sont re-sondés par les cycles suivants : pas de tours supplémentaires
+    no_retry = RetryScheduler(max_retries=0)
+    
+    print(f"{Colors.CYAN}[*] Surveillance de {len(addresses)} hôte(s), {len(ports)} ports{Colors.RESET}")
+    print(f"{Colors.CYAN}[*] Budget: {budget} sondes toutes les {interval:.0f}s (Ctrl+C pour arrêter){Colors.RESET}\n")
+    
+    while True:
+        cycle_start = time.time()
+        for host, host_ports in scheduler.next_batch().items():
+            scanner = PortScanner(host, ports=host_ports, threads=bounded_threads(threads, host_ports),
+                                  timeout=timeout, transport=transport, verbose=False)
+            scanner.retry_scheduler = no_retry
+            results = scanner.scan()
+            open_ports = set(results['open_ports'])
+            filtered_ports = set(results['filtered_ports'])
+            unresolved_ports = set(results['unresolved_ports'])
+            for port in host_ports:
+                if port in unresolved_ports:
+                    # Non testé (ressources locales épuisées) : ni fermé, ni sondé
+                    scheduler.skip(host, port)
+                    continue
+                if port in open_ports:
+                    state = PORT_OPEN
+                elif port in filtered_ports:
+                    state = PORT_FILTERED
+                else:
+                    state = PORT_CLOSED
+                event = scheduler.record(host, port, state, **results['services'].get(port, {}))
+                if event:
+                    print_change(event)
+        
+        logger.debug(f"Cycle {scheduler.cycles}: {scheduler.get_stats()}")
+        time.sleep(max(0.0, interval - (time.time() - cycle_start)))
+
+def create_postprocessor(workers: int = None, plugin_specs: List[str] = None) -> 'PostProcessor':
+    """
+    Crée et démarre l'étage de post-traitement
+    
+    Args:
+        workers: Processus du pool (None = configuration)
+        plugin_specs: Plugins supplémentaires au format 'module:Classe'
+    
+    Raises:
+        ValueError: Si un plugin ne peut pas être chargé
+    """
+    from .postprocess import PostProcessor, ServiceFingerprintPlugin, load_plugin
+    
+    plugins = [ServiceFingerprintPlugin()] + [load_plugin(spec) for spec in plugin_specs or []]
+    postprocessor = PostProcessor(plugins=plugins, workers=workers)
+    postprocessor.start()
+    logger.info(f"Post-traitement: {postprocessor.workers} processus, "
+                f"plugins: {', '.join(p.name for p in plugins)}")
+    return postprocessor
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Scanner de Ports & Services Intelligent',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemples d'utilisation:
+  scanner-ports 192.168.1.1
+  scanner-ports 192.168.1.1 -p 80,443,22,3389
+  scanner-ports 192.168.1.1 -p 1-1000 -t 200
+  scanner-ports scanme.nmap.org -o rapport.txt
+  scanner-ports 192.168.1.1 192.168.1.2 --host-rate 100
+  scanner-ports 192.168.1.1 -p 1-65535 --postprocess-workers 4 --plugin mes_plugins:TlsPlugin
+  scanner-ports --daemon --listen 127.0.0.1:8765
+  scanner-ports 10.0.0.0 10.0.0.1 --coordinator --listen 0.0.0.0:8766
+  scanner-ports --worker 10.0.0.254:8766
+  scanner-ports 192.168.1.0 192.168.1.1 --watch --watch-budget 200
+        """
+    )
+    
+    parser.add_argument('targets', nargs='*', metavar='target', help='Adresse(s) IP ou domaine(s) cible(s)')
+    parser.add_argument('-p', '--ports', type=str, help='Ports à scanner (ex: 80,443 ou 1-1000)')
+    parser.add_argument('-t', '--threads', type=int, default=100, help='Nombre de threads (défaut: 100)')
+    parser.add_argument('--timeout', type=float, default=1.0, help='Timeout en secondes (défaut: 1.0)')
+    parser.add_argument('-o', '--output', type=str, help='Fichier de sortie pour le rapport')
+    parser.add_argument('--fast', action='store_true', help='Scan rapide (ports communs seulement)')
+    parser.add_argument('--host-max-inflight', type=int,
+                       help='Part normale de sondes simultanées par hôte (multi-hôtes, défaut: 32)')
+    parser.add_argument('--host-rate', type=float,
+                       help='Sondes par seconde maximales par hôte (multi-hôtes)')
+    parser.add_argument('--postprocess-workers', type=int, metavar='N',
+                       help='Identifie les services et exécute les plugins dans N processus séparés')
+    parser.add_argument('--plugin', action='append', metavar='MODULE:CLASSE',
+                       help="Plugin d'analyse supplémentaire (répétable, active le post-traitement)")
+    
+    parser.add_argument('--watch', action='store_true',
+                       help="Surveillance continue: rescanne en boucle et n'affiche que les changements")
+    parser.add_argument('--watch-interval', type=float,
+                       help=f"Durée d'un cycle de surveillance en secondes (défaut: {WATCH_CONFIG['interval']:.0f})")
+    parser.add_argument('--watch-budget', type=int,
+                       help=f"Sondes par cycle de surveillance (défaut: {WATCH_CONFIG['budget']})")
+    parser.add_argument('--daemon', action='store_true',
+                       help='Mode démon: accepte des jobs de scan via une API JSON locale')
+    parser.add_argument('--listen', type=str,
+                       help=f"Adresse d'écoute du démon (défaut: {DAEMON_CONFIG['host']}:{DAEMON_CONFIG['port']})")
+    parser.add_argument('--unix-socket', type=str, help='Socket Unix du démon (au lieu de HTTP TCP)')
+    parser.add_argument('--coordinator', action='store_true',
+                       help='Mode distribué: répartit le scan sur des workers (écoute sur --listen)')
+    parser.add_argument('--worker', type=str, metavar='HOTE:PORT',
+                       help='Mode worker: traite les lots du coordinateur donné')
+    
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                       default='INFO', help='Niveau de logging (défaut: INFO)')
+    parser.add_argument('--log-file', type=str, help='Fichier de log (optionnel)')
+    
+    args = parser.parse_args()
+    
+    # Configure le logging
+    log_level = getattr(logging, args.log_level.upper(), logging.INFO)
+    log_file = args.log_file or LOGGING_CONFIG.get('log_file', '').format(
+        timestamp=datetime.now().strftime('%Y%m%d_%H%M%S')
+    )
+    
+    setup_logger(
+        name='port_scanner',
+        level=log_level,
+        log_file=log_file if LOGGING_CONFIG.get('file', True) else None,
+        log_dir=LOGGING_CONFIG.get('log_dir', 'logs')
+    )
+    
+    logger.info("=" * 70)
+    logger.info("Démarrage du Scanner de Ports & Services Intelligent")
+    logger.info("=" * 70)
+    
+    if args.daemon:
+        run_daemon(listen=args.listen, unix_socket=args.unix_socket)
+        return
+    
+    if args.worker:
+        from .utils.distributed import run_worker
+        
+        host, port = parse_address(args.worker, '127.0.0.1', DISTRIBUTED_CONFIG.get('port', 8766))
+        try:
+            run_worker(host, port, create_chunk_scanner(),
+                       heartbeat_interval=DISTRIBUTED_CONFIG.get('heartbeat_interval', 5.0))
+        except OSError as e:
+            logger.error(f"Connexion au coordinateur impossible: {e}")
+            print(f"{Colors.RED}[!] Erreur: {e}{Colors.RESET}")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            print(f"\n{Colors.YELLOW}[!] Worker arrêté{Colors.RESET}")
+        return
+    
+    if not args.targets:
+        parser.error("au moins une cible est requise (sauf en mode --daemon)")
+    
+    # Valide les cibles
+    for target in args.targets:
+        try:
+            target_ip = validate_target(target)
+            if target_ip != target:
+                print(f"{Colors.CYAN}[*] {target} résolu en {target_ip}{Colors.RESET}")
+                logger.info(f"Cible résolue: {target} -> {target_ip}")
+        except ValidationError as e:
+            logger.error(f"Erreur de validation de la cible: {e}")
+            print(f"{Colors.RED}[!] Erreur: {e}{Colors.RESET}")
+            sys.exit(1)
+    
+    # Détermine les ports à scanner
+    if args.fast:
+        ports = list(SERVICES_COMMON.keys())
+        print(f"{Colors.YELLOW}[!] Mode rapide: scan des ports communs uniquement{Colors.RESET}\n")
+        logger.info(f"Mode rapide: {len(ports)} ports communs")
+    elif args.ports:
+        try:
+            ports = parse_ports(args.ports)
+            logger.info(f"Ports spécifiés: {len(ports)} port(s)")
+        except ValidationError as e:
+            logger.error(f"Erreur de validation des ports: {e}")
+            print(f"{Colors.RED}[!] Erreur: {e}{Colors.RESET}")
+            sys.exit(1)
+    else:
+        ports = None  # Utilisera la valeur par défaut (1-1000)
+        logger.info("Utilisation des ports par défaut (1-1000)")
+    
+    # Lance le scan
+    if args.watch:
+        try:
+            run_watch(args.targets, ports, args.threads, args.timeout,
+                      interval=args.watch_interval, budget=args.watch_budget)
+        except KeyboardInterrupt:
+            print(f"\n{Colors.YELLOW}[!] Surveillance arrêtée{Colors.RESET}")
+        return
+    
+    if args.coordinator:
+        try:
+            scan_results = run_distributed(args.targets, ports, args.threads, args.timeout, args.listen)
+        except KeyboardInterrupt:
+            print(f"\n{Colors.YELLOW}[!] Scan interrompu par l'utilisateur{Colors.RESET}")
+            sys.exit(1)
+        generate_host_reports(scan_results, args.output)
+        return
+    
+    postprocessor = None
+    if args.postprocess_workers is not None or args.plugin:
+        try:
+            postprocessor = create_postprocessor(args.postprocess_workers, args.plugin)
+        except ValueError as e:
+            logger.error(f"Erreur de chargement des plugins: {e}")
+            print(f"{Colors.RED}[!] Erreur: {e}{Colors.RESET}")
+            sys.exit(1)
+    
+    if len(args.targets) > 1:
+        scanner = MultiHostScanner(
+            targets=args.targets,
+            ports=ports,
+            threads=args.threads,
+            timeout=args.timeout,
+            host_max_in_flight=args.host_max_inflight,
+            host_rate=args.host_rate,
+            postprocessor=postprocessor,
+            progress=True
+        )
+    else:
+        scanner = PortScanner(
+            target=args.targets[0],
+            ports=ports,
+            threads=args.threads,
+            timeout=args.timeout,
+            postprocessor=postprocessor,
+            progress=True
+        )
+    
+    try:
+        scan_results = scanner.scan()
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}[!] Scan interrompu par l'utilisateur{Colors.RESET}")
+        sys.exit(1)
+    finally:
+        if postprocessor:
+            postprocessor.close()
+    
+    if isinstance(scanner, MultiHostScanner):
+        generate_host_reports(scan_results, args.output)
+    else:
+        generate_reports(scan_results, args.output)
+
+def generate_reports(scan_results: Dict, output: str = None):
+    """Analyse les risques puis affiche (et sauvegarde) le rapport d'un hôte"""
+    from .analysis import RiskAnalyzer
+    from .report import ReportGenerator
+    
+    # Analyse les risques
+    analyzer = RiskAnalyzer(scan_results)
+    risks = analyzer.analyze()
+    
+    # Génère le rapport
+    report_generator = ReportGenerator(scan_results, risks)
+    report_generator.generate_console_report()
+    
+    # Sauvegarde dans un fichier si demandé
+    if output:
+        report_generator.generate_file_report(output)
+        print(f"{Colors.GREEN}[+] Rapport sauvegardé dans {output}{Colors.RESET}\n")
+
+def generate_host_reports(results_by_host: Dict[str, Dict], output: str = None):
+    """Génère un rapport par hôte (fichier suffixé par l'adresse de l'hôte)"""
+    root, ext = os.path.splitext(output) if output else (None, None)
+    for host, host_results in results_by_host.items():
+        host_output = f"{root}_{host}{ext or '.txt'}" if output else None
+        generate_reports(host_results, host_output)
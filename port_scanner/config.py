@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Configuration centralisée pour Scanner de Ports & Services Intelligent
+"""
+
+import os
+from typing import Dict
+
+# Chemins par défaut (rapports et logs relatifs au répertoire courant,
+# le paquet pouvant être installé dans un répertoire en lecture seule)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORTS_DIR = 'reports'
+LOGS_DIR = 'logs'
+
+# Configuration du scanner
+SCANNER_CONFIG = {
+    'default_threads': 100,
+    'default_timeout': 1.0,
+    'default_ports': list(range(1, 1001)),
+    'max_ports': 65535,
+    'banner_timeout': 2.0,          # Attente maximale du banner d'un port ouvert (s)
+    # Gestion des ressources socket
+    'socket_linger_zero': True,     # Ferme avec RST pour éviter TIME_WAIT
+    'fd_reserve': 64,               # Descripteurs gardés libres
+    'ephemeral_usage_ratio': 0.8,   # Part maximale de ip_local_port_range
+    'resource_max_retries': 5,      # Tentatives après épuisement des ressources
+    'resource_retry_delay': 0.05,   # Attente de base avant nouvelle tentative (s)
+    # Politesse par hôte (scans multi-hôtes)
+    'host_max_in_flight': 32,       # Part normale de sondes simultanées par hôte
+    'host_burst_ceiling': 128,      # Plafond absolu d'un hôte réactif empruntant la capacité libre
+    'host_rate_limit': None,        # Sondes par seconde par hôte (None = illimité)
+    # Retransmission des ports filtrés
+    'filtered_max_retries': 2,      # Tours de retransmission après le balayage
+    'filtered_retry_delay': 0.5,    # Attente avant le premier tour (s)
+    'filtered_retry_backoff': 2.0,  # Facteur exponentiel entre les tours
+    'filtered_max_ratio': 0.5,      # Pas de retransmission si l'hôte filtre par défaut
+    # Affichage de la progression
+    'progress_interval': 0.25,      # Rafraîchissement sur un terminal (s)
+    'progress_log_interval': 10.0,  # Ligne simple quand la sortie n'est pas un terminal (s)
+}
+
+# Configuration de la surveillance continue (--watch)
+WATCH_CONFIG = {
+    'interval': 10.0,               # Durée d'un cycle (s)
+    'budget': 500,                  # Sondes par cycle (charge réseau bornée)
+    'open_weight': 2.0,             # Poids d'un port actuellement ouvert
+    'change_boost': 4.0,            # Poids d'un hôte ayant changé récemment
+    'change_window': 600.0,         # Durée pendant laquelle un hôte reste instable (s)
+    'rescan_share': 0.5,            # Part du budget réservée aux rescans dus pendant le balayage initial
+}
+
+# Dictionnaire des ports et services communs
+SERVICES_COMMON = {
+    21: 'FTP', 22: 'SSH', 23: 'Telnet', 25: 'SMTP', 53: 'DNS',
+    80: 'HTTP', 110: 'POP3', 111: 'RPC', 135: 'MSRPC', 139: 'NetBIOS',
+    143: 'IMAP', 443: 'HTTPS', 445: 'SMB', 993: 'IMAPS', 995: 'POP3S',
+    1433: 'MSSQL', 3306: 'MySQL', 3389: 'RDP', 5432: 'PostgreSQL',
+    5900: 'VNC', 8080: 'HTTP-Proxy', 8443: 'HTTPS-Alt', 27017: 'MongoDB'
+}
+
+# Ports sensibles avec niveaux de risque
+SENSITIVE_PORTS = {
+    # Très critique
+    22: {'service': 'SSH', 'risk': 'HIGH', 'description': 'Accès à distance - Utiliser des clés SSH, désactiver l\'authentification par mot de passe'},
+    23: {'service': 'Telnet', 'risk': 'CRITICAL', 'description': 'Protocole non chiffré - Remplacer par SSH'},
+    3389: {'service': 'RDP', 'risk': 'HIGH', 'description': 'Accès bureau à distance - Activer NLA, utiliser VPN'},
+    445: {'service': 'SMB', 'risk': 'HIGH', 'description': 'Partage de fichiers Windows - Vérifier les versions, désactiver SMBv1'},
+    139: {'service': 'NetBIOS', 'risk': 'MEDIUM', 'description': 'Service réseau Windows - Peut révéler des informations'},
+    135: {'service': 'MSRPC', 'risk': 'MEDIUM', 'description': 'RPC Microsoft - Peut être exploité'},
+    5900: {'service': 'VNC', 'risk': 'HIGH', 'description': 'Accès bureau distant - Non chiffré par défaut, utiliser SSH tunnel'},
+    
+    # Moyennement critique
+    21: {'service': 'FTP', 'risk': 'MEDIUM', 'description': 'Protocole non chiffré - Utiliser SFTP/FTPS'},
+    1433: {'service': 'MSSQL', 'risk': 'MEDIUM', 'description': 'Base de données - Restreindre l\'accès réseau'},
+    3306: {'service': 'MySQL', 'risk': 'MEDIUM', 'description': 'Base de données - Restreindre l\'accès réseau'},
+    5432: {'service': 'PostgreSQL', 'risk': 'MEDIUM', 'description': 'Base de données - Restreindre l\'accès réseau'},
+    27017: {'service': 'MongoDB', 'risk': 'MEDIUM', 'description': 'Base de données NoSQL - Vérifier l\'authentification'},
+    
+    # Informations
+    80: {'service': 'HTTP', 'risk': 'LOW', 'description': 'Serveur web - Rediriger vers HTTPS'},
+    443: {'service': 'HTTPS', 'risk': 'LOW', 'description': 'Serveur web sécurisé - Vérifier les certificats'},
+    25: {'service': 'SMTP', 'risk': 'LOW', 'description': 'Serveur de messagerie - Vérifier la configuration'},
+}
+
+# Configuration du mode démon
+DAEMON_CONFIG = {
+    'host': '127.0.0.1',            # Écoute locale uniquement
+    'port': 8765,
+    'workers': 2,                   # Jobs exécutés en parallèle
+    'dns_ttl': 300.0,               # Durée de vie du cache DNS (s)
+    'result_ttl': 3600.0,           # Durée de conservation des résultats (s)
+    'result_max_age': 30.0,         # Âge maximal d'un résultat réutilisé par défaut (s)
+    'history': 256,                 # Jobs terminés conservés
+    'banner_timeout': 0.3,          # Attente du banner dans un job (s), le job attend le plus lent
+    'retry_delay': 0.05,            # Attente avant le premier tour de retransmission d'un job (s)
+}
+
+# Configuration du mode distribué (coordinateur / workers)
+DISTRIBUTED_CONFIG = {
+    'host': '127.0.0.1',            # Adresse d'écoute du coordinateur
+    'port': 8766,
+    'chunk_size': 256,              # Ports par lot loué
+    'lease_timeout': 30.0,          # Silence maximal d'un worker avant reprise du lot (s)
+    'lease_max_duration': 600.0,    # Durée maximale d'un bail, même avec battements de cœur (s)
+    'heartbeat_interval': 5.0,      # Battements de cœur des workers (s)
+    'chunk_max_attempts': 3,        # Locations d'un lot avant son abandon (ports non testés)
+}
+
+# Configuration du post-traitement (plugins exécutés dans un pool de processus)
+POSTPROCESS_CONFIG = {
+    'workers': None,                # Processus du pool (None = un par CPU si un plugin est cpu_bound, sinon 0)
+    'batch_size': 64,               # Ports ouverts par lot
+    'batch_timeout': 0.2,           # Attente maximale d'un lot incomplet (s)
+    'queue_size': 4096,             # Capacité de la file d'entrée
+    'max_pending_batches': None,    # Lots en cours dans le pool (None = 2 par processus)
+}
+
+# Configuration du logging
+LOGGING_CONFIG = {
+    'level': 'INFO',
+    'log_dir': LOGS_DIR,
+    'log_file': 'port_scanner_{timestamp}.log',
+    'console': True,
+    'file': True,
+}
+
+def get_config() -> Dict:
+    """Retourne la configuration complète"""
+    return {
+        'scanner': SCANNER_CONFIG,
+        'services_common': SERVICES_COMMON,
+        'sensitive_ports': SENSITIVE_PORTS,
+        'watch': WATCH_CONFIG,
+        'daemon': DAEMON_CONFIG,
+        'distributed': DISTRIBUTED_CONFIG,
+        'postprocess': POSTPROCESS_CONFIG,
+        'logging': LOGGING_CONFIG,
+    }
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Post-traitement des ports ouverts dans un pool de processus
+
+Les workers réseau ne font que déposer les ports ouverts dans une file bornée ;
+un thread de répartition les regroupe en lots et les confie à un
+ProcessPoolExecutor où s'exécutent les plugins (identification du service,
+enrichissement, analyses personnalisées). Le travail CPU ne dispute donc plus
+le GIL aux threads qui sondent le réseau.
+
+Le pool n'est utile que pour des plugins coûteux : lancer des processus et
+sérialiser chaque lot coûte plus cher qu'une simple recherche de mots-clés.
+Sans plugin déclaré `cpu_bound`, les plugins s'exécutent par défaut dans le
+thread de répartition.
+
+Un plugin est une classe définie au niveau d'un module importable : les
+processus du pool sont lancés en mode spawn et réimportent ce module pour
+désérialiser le plugin :
+
+    class TlsPlugin(AnalysisPlugin):
+        name = 'tls'
+        cpu_bound = True    # Analyse coûteuse : exécutée dans le pool
+
+        def process(self, record):
+            if record['port'] == 443:
+                return {'note': 'vérifier le certificat'}
+"""
+
+import importlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from queue import Empty, Full, Queue
+from typing import Dict, List, Optional
+
+from .config import POSTPROCESS_CONFIG
+from .signatures import match_service
+
+logger = logging.getLogger('port_scanner')
+
+# Marqueur envoyé au thread de répartition pour expédier le lot en cours
+_FLUSH = object()
+
+
+class AnalysisPlugin:
+    """
+    Analyseur exécuté sur chaque port ouvert
+
+    Le record reçu contient 'host', 'port', 'service' (nom déduit du numéro de
+    port) et 'banner' (banner complet ou chaîne vide). process() retourne un
+    dictionnaire de résultats, rangé sous services[port]['plugins'][name], ou
+    None s'il n'y a rien à signaler. Une clé 'service' dans le résultat
+    remplace le nom du service. Un plugin coûteux en CPU déclare cpu_bound :
+    sa présence fait démarrer le pool de processus par défaut.
+    """
+
+    name = 'plugin'
+    cpu_bound = False
+
+    def process(self, record: Dict) -> Optional[Dict]:
+        raise NotImplementedError
+
+
+class ServiceFingerprintPlugin(AnalysisPlugin):
+    """Identifie le service à partir des signatures de banners"""
+
+    name = 'fingerprint'
+
+    def process(self, record: Dict) -> Optional[Dict]:
+        service = match_service(record['port'], record.get('banner') or '')
+        return {'service': service} if service else None
+
+
+def load_plugin(spec: str) -> AnalysisPlugin:
+    """
+    Instancie un plugin désigné par 'module:Classe'
+
+    Raises:
+        ValueError: Si la désignation est invalide ou ne désigne pas un plugin
+    """
+    module_name, _, class_name = spec.partition(':')
+    if not module_name or not class_name:
+        raise ValueError(f"Plugin invalide: {spec} (format attendu: module:Classe)")
+    try:
+        plugin_class = getattr(importlib.import_module(module_name), class_name)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"Plugin introuvable: {spec} ({e})")
+    if not (isinstance(plugin_class, type) and issubclass(plugin_class, AnalysisPlugin)):
+        raise ValueError(f"{spec} n'est pas un AnalysisPlugin")
+    return plugin_class()
+
+
+def process_record(plugins: List[AnalysisPlugin], record: Dict) -> Dict:
+    """Applique les plugins à un port ouvert ; une erreur de plugin n'arrête pas les autres"""
+    findings = {}
+    for plugin in plugins:
+        try:
+            result = plugin.process(record)
+        except Exception as e:
+            result = {'error': f"{type(e).__name__}: {e}"}
+        if result:
+            findings[plugin.name] = result
+    return dict(record, plugins=findings)
+
+
+# Plugins du processus courant (installés une fois par processus du pool)
+_worker_plugins = []
+
+
+def _init_worker(plugins: List[AnalysisPlugin]):
+    global _worker_plugins
+    _worker_plugins = plugins
+
+
+def _process_batch(records: List[Dict]) -> List[Dict]:
+    return [process_record(_worker_plugins, record) for record in records]
+
+
+class PostProcessor:
+    """
+    Étage de post-traitement par lots, découplé des workers réseau
+
+    submit() est appelé par les workers de scan : il ne fait qu'un dépôt dans
+    la file. Le nombre de lots confiés au pool est borné ; quand le pool est
+    saturé, la file se remplit puis freine les dépôts (cas pathologique, la
+    file étant dimensionnée pour absorber des milliers de ports ouverts).
+    """
+
+    def __init__(self, plugins: List[AnalysisPlugin] = None, workers: int = None,
+                 batch_size: int = None, batch_timeout: float = None, queue_size: int = None,
+                 max_pending_batches: int = None):
+        """
+        Args:
+            plugins: Plugins à appliquer (identification du service par défaut)
+            workers: Processus du pool (0 = plugins exécutés dans le thread de
+                répartition, sans pool ; défaut: configuration, sinon un par
+                CPU si un plugin est cpu_bound et 0 autrement)
+            batch_size: Nombre maximal de ports par lot
+            batch_timeout: Attente maximale avant d'expédier un lot incomplet (s)
+            queue_size: Capacité de la file d'entrée
+            max_pending_batches: Lots en cours de traitement dans le pool
+        """
+        self.plugins = plugins if plugins is not None else [ServiceFingerprintPlugin()]
+        if workers is None:
+            workers = POSTPROCESS_CONFIG.get('workers')
+        if workers is None:
+            workers = (os.cpu_count() or 1) if any(p.cpu_bound for p in self.plugins) else 0
+        self.workers = workers
+        self.batch_size = batch_size or POSTPROCESS_CONFIG.get('batch_size', 64)
+        self.batch_timeout = (batch_timeout if batch_timeout is not None
+                              else POSTPROCESS_CONFIG.get('batch_timeout', 0.2))
+        self.queue = Queue(maxsize=queue_size or POSTPROCESS_CONFIG.get('queue_size', 4096))
+        self.pending_batches = threading.BoundedSemaphore(
+            max_pending_batches or POSTPROCESS_CONFIG.get('max_pending_batches') or 2 * max(workers, 1))
+
+        self.condition = threading.Condition()
+        self.submitted = 0
+        self.completed = 0
+        self.results = []
+        self.stats = {'batches': 0, 'records': 0, 'plugin_errors': 0, 'queue_full': 0}
+        self.executor = None
+        self.dispatcher = None
+
+    def start(self):
+        """Démarre le pool et le thread de répartition"""
+        if self.workers > 0:
+            # Les processus du pool ne naissent qu'au premier lot, quand les threads de
+            # scan tournent déjà : un fork d'un processus multi-thread peut se bloquer
+            self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                mp_context=multiprocessing.get_context('spawn'),
+                                                initializer=_init_worker, initargs=(self.plugins,))
+        self.dispatcher = threading.Thread(target=self._dispatch, name='postprocess-dispatch',
+                                           daemon=True)
+        self.dispatcher.start()
+        logger.debug(f"Post-traitement démarré ({self.workers} processus, "
+                     f"plugins: {', '.join(p.name for p in self.plugins)})")
+
+    def submit(self, record: Dict):
+        """Dépose un port ouvert (appelé depuis les workers de scan)"""
+        with self.condition:
+            self.submitted += 1
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            with self.condition:
+                self.stats['queue_full'] += 1
+            self.queue.put(record)
+
+    def flush(self, host: str = None) -> List[Dict]:
+        """
+        Attend le traitement de tous les ports déposés et retourne les résultats
+
+        Args:
+            host: Ne retourne (et ne retire) que les résultats de cet hôte
+
+        Returns:
+            Records enrichis d'une clé 'plugins'
+        """
+        self.queue.put(_FLUSH)
+        with self.condition:
+            self.condition.wait_for(lambda: self.completed >= self.submitted)
+            if host is None:
+                records, self.results = self.results, []
+            else:
+                records = [r for r in self.results if r['host'] == host]
+                self.results = [r for r in self.results if r['host'] != host]
+        return records
+
+    def close(self) -> List[Dict]:
+        """Traite les derniers ports, arrête le pool et retourne les résultats restants"""
+        records = self.flush()
+        self.queue.put(None)
+        self.dispatcher.join()
+        if self.executor:
+            self.executor.shutdown(wait=True)
+        if self.stats['plugin_errors']:
+            logger.warning(f"{self.stats['plugin_errors']} erreur(s) de plugin pendant le post-traitement")
+        logger.debug(f"Post-traitement terminé: {self.stats['records']} port(s) en "
+                     f"{self.stats['batches']} lot(s), file pleine {self.stats['queue_full']} fois")
+        return records
+
+    def __enter__(self) -> 'PostProcessor':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _dispatch(self):
+        """Regroupe les ports déposés en lots (taille ou délai atteint)"""
+        stop = False
+        while not stop:
+            record = self.queue.get()
+            if record is None:
+                break
+            if record is _FLUSH:
+                continue
+
+            batch = [record]
+            deadline = time.monotonic() + self.batch_timeout
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    record = self.queue.get(timeout=remaining)
+                except Empty:
+                    break
+                if record is None:
+                    stop = True
+                    break
+                if record is _FLUSH:
+                    break
+                batch.append(record)
+            self._send(batch)
+
+    def _send(self, batch: List[Dict]):
+        """Confie un lot au pool (bloque si trop de lots sont déjà en cours)"""
+        self.pending_batches.acquire()
+        if self.executor is None:
+            future = Future()
+            future.set_result([process_record(self.plugins, record) for record in batch])
+        else:
+            try:
+                future = self.executor.submit(_process_batch, batch)
+            except RuntimeError as e:
+                # Pool arrêté ou cassé : le lot est rendu sans analyse
+                future = Future()
+                future.set_exception(e)
+        future.add_done_callback(lambda f, batch=batch: self._collect(batch, f))
+
+    def _collect(self, batch: List[Dict], future: Future):
+        """Range les résultats d'un lot (appelé à la fin de son traitement)"""
+        self.pending_batches.release()
+        try:
+            records = future.result()
+        except Exception as e:
+            logger.warning(f"Échec du post-traitement d'un lot de {len(batch)} port(s): {e}")
+            records = [dict(record, plugins={}) for record in batch]
+
+        errors = sum(1 for r in records for data in r['plugins'].values() if 'error' in data)
+        with self.condition:
+            self.results.extend(records)
+            self.completed += len(batch)
+            self.stats['batches'] += 1
+            self.stats['records'] += len(batch)
+            self.stats['plugin_errors'] += errors
+            self.condition.notify_all()
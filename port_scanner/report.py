@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Génération des rapports de scan (console et fichier)
+"""
+
+from datetime import datetime
+from typing import Dict, List
+
+from .analysis import RiskAnalyzer
+from .utils.colors import Colors
+
+class ReportGenerator:
+    def __init__(self, scan_results: Dict, risks: Dict):
+        self.scan_results = scan_results
+        self.risks = risks
+        self.analyzer = RiskAnalyzer(scan_results)
+    
+    def get_plugin_lines(self, port: int) -> List[str]:
+        """Retourne les résultats des plugins de post-traitement pour un port"""
+        findings = self.scan_results['services'].get(port, {}).get('plugins', {})
+        lines = []
+        for name, data in findings.items():
+            # Le nom du service est déjà affiché dans la colonne service
+            details = ', '.join(f"{key}={value}" for key, value in data.items() if key != 'service')
+            if details:
+                lines.append(f"[{name}] {details}")
+        return lines
+    
+    def generate_console_report(self):
+        """Génère un rapport dans la console"""
+        target = self.scan_results['target']
+        open_ports = self.scan_results['open_ports']
+        services = self.scan_results['services']
+        duration = self.scan_results['scan_duration']
+        
+        print(f"\n{Colors.BOLD}{'='*70}{Colors.RESET}")
+        print(f"{Colors.BOLD}RAPPORT DE SCAN - {target}{Colors.RESET}")
+        print(f"{Colors.BOLD}{'='*70}{Colors.RESET}")
+        print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Durée du scan: {duration:.2f} secondes")
+        print(f"Ports scannés: {self.scan_results['total_ports_scanned']}")
+        print(f"Ports ouverts: {len(open_ports)}")
+        print(f"Ports filtrés (sans réponse): {len(self.scan_results.get('filtered_ports', []))}\n")
+        
+        unresolved = self.scan_results.get('unresolved_ports', [])
+        if unresolved:
+            print(f"{Colors.YELLOW}[!] {len(unresolved)} port(s) non testé(s) faute de ressources locales{Colors.RESET}\n")
+        
+        if not open_ports:
+            print(f"{Colors.GREEN}[+] Aucun port ouvert détecté{Colors.RESET}\n")
+            return
+        
+        print(f"{Colors.BOLD}PORTS OUVERTS ET SERVICES:{Colors.RESET}\n")
+        
+        # Affiche les ports par niveau de risque
+        for risk_level in ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']:
+            risk_ports = self.risks.get(risk_level, [])
+            if risk_ports:
+                color = {
+                    'CRITICAL': Colors.RED,
+                    'HIGH': Colors.YELLOW,
+                    'MEDIUM': Colors.BLUE,
+                    'LOW': Colors.GREEN
+                }.get(risk_level, Colors.RESET)
+                
+                print(f"{color}{Colors.BOLD}[{risk_level}]{Colors.RESET}")
+                for item in risk_ports:
+                    port = item['port']
+                    service = item['service']
+                    banner = item.get('banner')
+                    
+                    print(f"  {Colors.CYAN}Port {port:5d}{Colors.RESET} - {Colors.MAGENTA}{service:15s}{Colors.RESET}", end='')
+                    if banner:
+                        banner_preview = banner[:50] + '...' if len(banner) > 50 else banner
+                        print(f" | {Colors.YELLOW}{banner_preview}{Colors.RESET}")
+                    else:
+                        print()
+                    for line in self.get_plugin_lines(port):
+                        print(f"    {Colors.BLUE}{line}{Colors.RESET}")
+                print()
+        
+        # Résumé des risques
+        print(self.analyzer.get_summary())
+        
+        # Détails des risques
+        print(f"{Colors.BOLD}{'='*70}{Colors.RESET}")
+        print(f"{Colors.BOLD}RÉCOMMANDATIONS DE SÉCURITÉ{Colors.RESET}")
+        print(f"{Colors.BOLD}{'='*70}{Colors.RESET}\n")
+        
+        for risk_level in ['CRITICAL', 'HIGH', 'MEDIUM']:
+            risk_items = self.risks.get(risk_level, [])
+            if risk_items:
+                color = {
+                    'CRITICAL': Colors.RED,
+                    'HIGH': Colors.YELLOW,
+                    'MEDIUM': Colors.BLUE
+                }.get(risk_level, Colors.RESET)
+                
+                print(f"{color}{Colors.BOLD}[{risk_level}]{Colors.RESET}")
+                for item in risk_items:
+                    print(f"  {Colors.CYAN}Port {item['port']:5d} ({item['service']}):{Colors.RESET}")
+                    print(f"    {item['description']}\n")
+        
+        print(f"{Colors.BOLD}{'='*70}{Colors.RESET}\n")
+    
+    def generate_file_report(self, filename: str):
+        """Génère un rapport dans un fichier"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            target = self.scan_results['target']
+            open_ports = self.scan_results['open_ports']
+            duration = self.scan_results['scan_duration']
+            
+            f.write("="*70 + "\n")
+            f.write(f"RAPPORT DE SCAN - {target}\n")
+            f.write("="*70 + "\n")
+            f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"Durée du scan: {duration:.2f} secondes\n")
+            f.write(f"Ports scannés: {self.scan_results['total_ports_scanned']}\n")
+            f.write(f"Ports ouverts: {len(open_ports)}\n")
+            f.write(f"Ports filtrés (sans réponse): {len(self.scan_results.get('filtered_ports', []))}\n\n")
+            
+            unresolved = self.scan_results.get('unresolved_ports', [])
+            if unresolved:
+                f.write(f"Ports non testés (ressources locales épuisées): "
+                        f"{', '.join(str(p) for p in unresolved)}\n\n")
+            
+            if open_ports:
+                f.write("PORTS OUVERTS ET SERVICES:\n\n")
+                for risk_level in ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']:
+                    risk_ports = self.risks.get(risk_level, [])
+                    if risk_ports:
+                        f.write(f"[{risk_level}]\n")
+                        for item in risk_ports:
+                            f.write(f"  Port {item['port']:5d} - {item['service']:15s}")
+                            if item.get('banner'):
+                                f.write(f" | {item['banner']}")
+                            f.write("\n")
+                            for line in self.get_plugin_lines(item['port']):
+                                f.write(f"    {line}\n")
+                        f.write("\n")
+                
+                # Résumé
+                f.write("="*70 + "\n")
+                f.write("RÉSUMÉ DES RISQUES\n")
+                f.write("="*70 + "\n")
+                f.write(f"CRITIQUE: {len(self.risks['CRITICAL'])}\n")
+                f.write(f"ÉLEVÉ:    {len(self.risks['HIGH'])}\n")
+                f.write(f"MOYEN:    {len(self.risks['MEDIUM'])}\n")
+                f.write(f"FAIBLE:   {len(self.risks['LOW'])}\n\n")
+                
+                # Recommandations
+                f.write("="*70 + "\n")
+                f.write("RÉCOMMANDATIONS DE SÉCURITÉ\n")
+                f.write("="*70 + "\n\n")
+                
+                for risk_level in ['CRITICAL', 'HIGH', 'MEDIUM']:
+                    risk_items = self.risks.get(risk_level, [])
+                    if risk_items:
+                        f.write(f"[{risk_level}]\n")
+                        for item in risk_items:
+                            f.write(f"  Port {item['port']:5d} ({item['service']}):\n")
+                            f.write(f"    {item['description']}\n\n")
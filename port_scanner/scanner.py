@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Moteurs de scan : PortScanner (un hôte) et MultiHostScanner (plusieurs hôtes)
+"""
+
+import heapq
+import logging
+import os
+import socket
+import threading
+import time
+from queue import Queue
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from .config import SERVICES_COMMON, SCANNER_CONFIG
+from .signatures import match_service
+from .utils.colors import Colors
+from .utils.validators import validate_target, ValidationError
+from .utils.resources import SocketResourceManager, is_resource_error
+from .utils.transport import (Transport, SocketTransport, FILTERED, PORT_CLOSED,
+                              PORT_FILTERED, classify_result)
+from .utils.retry import RetryScheduler
+from .utils.progress import ProbeCounters, ProgressDisplay
+
+if TYPE_CHECKING:
+    from .postprocess import PostProcessor
+
+# Pas de handler à l'import : la CLI (ou l'application hôte) configure le logging
+logger = logging.getLogger('port_scanner')
+
+def create_socket_transport() -> SocketTransport:
+    """Crée le transport par défaut (sockets réels limités en ressources)"""
+    return SocketTransport(SocketResourceManager(
+        fd_reserve=SCANNER_CONFIG.get('fd_reserve', 64),
+        ephemeral_ratio=SCANNER_CONFIG.get('ephemeral_usage_ratio', 0.8),
+        linger_zero=SCANNER_CONFIG.get('socket_linger_zero', True)
+    ))
+
+def create_retry_scheduler(base_delay: float = None) -> RetryScheduler:
+    """Crée l'ordonnanceur de retransmissions selon la configuration"""
+    return RetryScheduler(
+        max_retries=SCANNER_CONFIG.get('filtered_max_retries', 2),
+        base_delay=base_delay if base_delay is not None else SCANNER_CONFIG.get('filtered_retry_delay', 0.5),
+        backoff=SCANNER_CONFIG.get('filtered_retry_backoff', 2.0),
+        max_filtered_ratio=SCANNER_CONFIG.get('filtered_max_ratio', 0.5)
+    )
+
+def create_progress_display(get_done: Callable[[], int], get_total: Callable[[], int],
+                            get_open: Callable[[], int]) -> ProgressDisplay:
+    """Crée l'affichage de progression selon la configuration"""
+    return ProgressDisplay(
+        get_done, get_total, get_open,
+        interval=SCANNER_CONFIG.get('progress_interval', 0.25),
+        log_interval=SCANNER_CONFIG.get('progress_log_interval', 10.0),
+        logger=logger
+    )
+
+def bounded_threads(threads: Optional[int], ports: Optional[List[int]]) -> int:
+    """
+    Limite le nombre de threads au nombre de ports d'un petit scan
+
+    Démarrer 100 threads pour sonder un seul port coûte plus cher que la sonde
+    elle-même (jobs du démon, lots distribués, cycles de surveillance).
+    """
+    threads = threads or SCANNER_CONFIG.get('default_threads', 100)
+    port_count = len(ports) if ports else len(SCANNER_CONFIG.get('default_ports', range(1, 1001)))
+    return max(1, min(threads, port_count))
+
+def log_transport_stats(stats: Dict):
+    """Signale en fin de scan une saturation des ressources locales"""
+    if stats.get('exhaustion_events'):
+        logger.warning(f"Ressources locales saturées {stats['exhaustion_events']} fois "
+                       f"(limite finale: {stats['limit']}/{stats['capacity']} sockets)")
+
+class PortScanner:
+    def __init__(self, target: str, ports: List[int] = None, threads: int = None, timeout: float = None,
+                 transport: Transport = None, on_open: Callable[[int, Dict], None] = None,
+                 verbose: bool = True, postprocessor: 'PostProcessor' = None, progress: bool = False,
+                 banner_timeout: float = None, retry_delay: float = None):
+        # Valide la cible
+        try:
+            self.target = validate_target(target)
+            logger.info(f"Initialisation du scanner pour: {target} (résolu: {self.target})")
+        except ValidationError as e:
+            logger.error(f"Erreur de validation de la cible: {e}")
+            raise
+        
+        self.ports = ports if ports else SCANNER_CONFIG.get('default_ports', list(range(1, 1001)))
+        self.threads = threads if threads else SCANNER_CONFIG.get('default_threads', 100)
+        self.timeout = timeout if timeout else SCANNER_CONFIG.get('default_timeout', 1.0)
+        self.banner_timeout = (banner_timeout if banner_timeout is not None
+                               else SCANNER_CONFIG.get('banner_timeout', 2.0))
+        self.open_ports = []
+        self.services = {}
+        self.lock = threading.Lock()
+        self.queue = Queue()
+        self.scan_start_time = None
+        
+        # Transport des sondes (sockets réels par défaut, limités en ressources)
+        self.transport = transport if transport else create_socket_transport()
+        self.max_resource_retries = SCANNER_CONFIG.get('resource_max_retries', 5)
+        self.resource_retry_delay = SCANNER_CONFIG.get('resource_retry_delay', 0.05)
+        self.resource_retries = {}
+        self.unresolved_ports = []
+        self.deferred = []  # Tas (échéance, port) des ports remis en file plus tard
+        self.requeue = self._defer
+        
+        # Ports sans réponse, re-sondés en fin de balayage
+        self.filtered_ports = set()
+        self.retry_scheduler = create_retry_scheduler(retry_delay)
+        
+        # Notifié à chaque port ouvert dès la connexion, avant la lecture du
+        # banner (flux de résultats du démon, etc.)
+        self.on_open = on_open
+        self.verbose = verbose
+        
+        # Progression : un compteur par worker, lu périodiquement par l'affichage
+        # (ligne affichée seulement sur demande, par la CLI)
+        self.progress = progress
+        self.probe_counts = ProbeCounters(self.threads)
+        self.probes_planned = 0
+        
+        # Identification du service et plugins déportés dans un pool de processus
+        self.postprocessor = postprocessor
+        
+    def get_service_banner(self, port: int) -> Tuple[str, str]:
+        """
+        Récupère le banner et tente d'identifier le service
+        
+        Avec un post-processeur, l'identification par signatures est laissée
+        au pool de processus : seul le nom déduit du port est retourné.
+        """
+        service_name = SERVICES_COMMON.get(port, 'Unknown')
+        banner = ''
+        
+        try:
+            banner = self.transport.grab_banner(self.target, port, self.timeout, self.banner_timeout) or ''
+        except socket.timeout:
+            logger.debug(f"Timeout lors de la récupération du banner pour le port {port}")
+        except socket.error as e:
+            logger.debug(f"Erreur socket lors de la récupération du banner pour le port {port}: {e}")
+        except Exception as e:
+            logger.warning(f"Erreur inattendue lors de la récupération du banner pour le port {port}: {e}")
+        
+        if banner and not self.postprocessor:
+            service_name = match_service(port, banner) or service_name
+        
+        return service_name, banner
+    
+    def scan_port(self, port: int) -> Optional[str]:
+        """
+        Scanne un port individuel
+        
+        Returns:
+            'open', 'closed' ou 'filtered', ou None si le port a été remis en
+            file faute de ressources locales
+        """
+        try:
+            result = self.transport.connect(self.target, port, self.timeout)
+        except Exception as e:
+            logger.warning(f"Erreur inattendue lors du scan du port {port}: {e}")
+            result = FILTERED
+        
+        if is_resource_error(result):
+            # Ressources locales épuisées : le port n'a pas été testé
+            self._retry_port(port, result)
+            return None
+        
+        state = classify_result(result)
+        if state == PORT_FILTERED:
+            logger.debug(f"Pas de réponse pour le port {port} (filtré)")
+            with self.lock:
+                self.filtered_ports.add(port)
+            return state
+        
+        with self.lock:
+            self.filtered_ports.discard(port)
+        if state == PORT_CLOSED:
+            return state
+        
+        # Port ouvert : signalé tout de suite, un service muet fait attendre
+        # la lecture du banner jusqu'à son timeout
+        if self.on_open:
+            self.on_open(port, {'name': SERVICES_COMMON.get(port, 'Unknown'), 'banner': None})
+        
+        # Récupère les informations du service
+        service_name, banner = self.get_service_banner(port)
+        
+        with self.lock:
+            self.open_ports.append(port)
+            self.services[port] = {
+                'name': service_name,
+                'banner': banner[:100] if banner else None  # Limite à 100 caractères
+            }
+        
+        logger.debug(f"Port {port} ouvert - Service: {service_name}")
+        if self.postprocessor:
+            self.postprocessor.submit({'host': self.target, 'port': port,
+                                       'service': service_name, 'banner': banner})
+        return state
+    
+    def _retry_port(self, port: int, code: int):
+        """Remet en file un port dont le test a échoué faute de ressources locales"""
+        with self.lock:
+            attempts = self.resource_retries.get(port, 0) + 1
+            self.resource_retries[port] = attempts
+        
+        if attempts > self.max_resource_retries:
+            logger.warning(f"Port {port} non testé après {self.max_resource_retries} tentatives "
+                           f"(ressources locales épuisées: {os.strerror(code)})")
+            with self.lock:
+                self.unresolved_ports.append(port)
+            return
+        
+        logger.debug(f"Ressources épuisées pour le port {port} ({os.strerror(code)}), "
+                     f"nouvelle tentative {attempts}/{self.max_resource_retries}")
+        # Le worker passe au port suivant : le port est remis en file à l'échéance
+        self.requeue(port, self.resource_retry_delay * attempts)
+    
+    def _defer(self, port: int, delay: float = 0.0):
+        """Remet un port en file après un délai, sans bloquer de worker"""
+        with self.lock:
+            heapq.heappush(self.deferred, (time.monotonic() + delay, port))
+    
+    def _release_deferred(self):
+        """Remet en file les ports différés arrivés à échéance"""
+        now = time.monotonic()
+        with self.lock:
+            while self.deferred and self.deferred[0][0] <= now:
+                self.queue.put(heapq.heappop(self.deferred)[1])
+    
+    def _drain(self):
+        """Attend la fin des sondes en file, ports différés compris"""
+        while True:
+            self.queue.join()
+            with self.lock:
+                if not self.deferred:
+                    return
+                wait = self.deferred[0][0] - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._release_deferred()
+    
+    def worker(self, slot: int = 0):
+        """Fonction de travail pour les threads (slot : emplacement de son compteur)"""
+        counts = self.probe_counts.slots
+        while True:
+            if self.deferred:
+                self._release_deferred()
+            port = self.queue.get()
+            if port is None:
+                break
+            
+            if self.scan_port(port) is not None:
+                counts[slot] += 1
+            self.queue.task_done()
+    
+    def scan(self) -> Dict:
+        """Lance le scan complet"""
+        if self.verbose:
+            print(f"{Colors.CYAN}[*] Démarrage du scan de {self.target}{Colors.RESET}")
+            print(f"{Colors.CYAN}[*] Ports à scanner: {len(self.ports)}{Colors.RESET}")
+            print(f"{Colors.CYAN}[*] Threads: {self.threads}{Colors.RESET}\n")
+        
+        self.scan_start_time = time.time()
+        self.probes_planned = len(self.ports)
+        self.transport.set_concurrency(self.threads)
+        display = None
+        if self.progress:
+            display = create_progress_display(self.probe_counts.total, lambda: self.probes_planned,
+                                              lambda: len(self.open_ports))
+            display.start()
+        
+        # Ajoute les ports à la queue
+        for port in self.ports:
+            self.queue.put(port)
+        
+        # Lance les threads workers
+        threads = []
+        for slot in range(self.threads):
+            t = threading.Thread(target=self.worker, args=(slot,))
+            t.start()
+            threads.append(t)
+        
+        # Attend la fin du balayage principal
+        self._drain()
+        
+        # Re-sonde les ports filtrés par tours successifs (la ligne de progression
+        # est effacée pendant les messages de retransmission)
+        if display:
+            display.pause()
+        for _, pending in self.retry_scheduler.rounds(lambda: self.filtered_ports, len(self.ports)):
+            self.probes_planned += len(pending)
+            if display:
+                display.resume()
+            for port in pending:
+                self.queue.put(port)
+            self._drain()
+            if display:
+                display.pause()
+        
+        if display:
+            display.stop()
+        
+        # Arrête les threads
+        for _ in range(self.threads):
+            self.queue.put(None)
+        for t in threads:
+            t.join()
+        
+        if self.postprocessor:
+            self.apply_postprocessing(self.postprocessor.flush(self.target))
+        
+        scan_duration = time.time() - self.scan_start_time
+        
+        results = self.get_results(scan_duration)
+        log_transport_stats(results['transport_stats'])
+        return results
+    
+    def apply_postprocessing(self, records: List[Dict]):
+        """Intègre aux services les résultats des plugins de post-traitement"""
+        for record in records:
+            info = self.services.get(record['port'])
+            findings = record.get('plugins')
+            if info is None or not findings:
+                continue
+            for data in findings.values():
+                if data.get('service'):
+                    info['name'] = data['service']
+            info['plugins'] = findings
+    
+    def get_results(self, scan_duration: float) -> Dict:
+        """Construit le dictionnaire de résultats du scan"""
+        # Trie les ports ouverts
+        self.open_ports.sort()
+        self.unresolved_ports.sort()
+        
+        return {
+            'target': self.target,
+            'open_ports': self.open_ports,
+            'filtered_ports': sorted(self.filtered_ports),
+            'services': self.services,
+            'scan_duration': scan_duration,
+            'total_ports_scanned': len(self.ports),
+            'unresolved_ports': self.unresolved_ports,
+            'transport_stats': self.transport.get_stats()
+        }
+
+class MultiHostScanner:
+    """Scan de plusieurs hôtes avec ordonnancement équitable et plafonds par hôte"""
+    
+    def __init__(self, targets: List[str], ports: List[int] = None, threads: int = None,
+                 timeout: float = None, transport: Transport = None,
+                 host_max_in_flight: int = None, host_rate: float = None, seed: int = None,
+                 postprocessor: 'PostProcessor' = None, progress: bool = False):
+        from .utils.scheduler import FairScheduler
+        
+        self.transport = transport if transport else create_socket_transport()
+        self.postprocessor = postprocessor
+        self.scanners = {}
+        for target in targets:
+            scanner = PortScanner(target, ports=ports, threads=threads, timeout=timeout,
+                                  transport=self.transport, postprocessor=postprocessor)
+            # Un même hôte peut être donné sous plusieurs noms
+            self.scanners.setdefault(scanner.target, scanner)
+        
+        first = next(iter(self.scanners.values()))
+        self.ports = first.ports
+        self.threads = first.threads
+        self.timeout = first.timeout
+        self.scheduler = FairScheduler(
+            list(self.scanners),
+            self.ports,
+            max_in_flight_per_host=host_max_in_flight or SCANNER_CONFIG.get('host_max_in_flight', 32),
+            rate_per_host=host_rate if host_rate else SCANNER_CONFIG.get('host_rate_limit'),
+            seed=seed,
+            burst_ceiling=SCANNER_CONFIG.get('host_burst_ceiling')
+        )
+        for host, scanner in self.scanners.items():
+            scanner.requeue = (lambda port, delay=0.0, host=host:
+                               self.scheduler.requeue(host, port, delay))
+        
+        self.progress = progress
+        self.probe_counts = ProbeCounters(self.threads)
+        self.probes_planned = 0
+    
+    def worker(self, slot: int = 0):
+        """Fonction de travail pour les threads (slot : emplacement de son compteur)"""
+        counts = self.probe_counts.slots
+        while True:
+            probe = self.scheduler.next_probe()
+            if probe is None:
+                break
+            
+            host, port = probe
+            start = time.monotonic()
+            state = self.scanners[host].scan_port(port)
+            elapsed = time.monotonic() - start
+            self.scheduler.complete(host, elapsed, timed_out=state == PORT_FILTERED)
+            if state is not None:
+                counts[slot] += 1
+    
+    def _pending_retries(self, hosts: List[str]) -> List[Tuple[str, int]]:
+        """Retourne les couples (hôte, port) encore filtrés parmi les hôtes donnés"""
+        return [(host, port) for host in hosts for port in self.scanners[host].filtered_ports]
+    
+    def _retry_hosts(self, retry_scheduler: RetryScheduler) -> List[str]:
+        """Retourne les hôtes à re-sonder : ceux qui ne filtrent pas par défaut"""
+        hosts = []
+        for host, scanner in self.scanners.items():
+            filtered = len(scanner.filtered_ports)
+            if retry_scheduler.is_default_drop(filtered, len(self.ports)):
+                logger.info(f"{host}: {filtered}/{len(self.ports)} sondes filtrées : "
+                            f"filtrage par défaut, pas de retransmission")
+            else:
+                hosts.append(host)
+        return hosts
+    
+    def _run_workers(self):
+        """Lance les workers jusqu'à épuisement de l'ordonnanceur"""
+        threads = []
+        for slot in range(self.threads):
+            t = threading.Thread(target=self.worker, args=(slot,))
+            t.start()
+            threads.append(t)
+        for t in threads:
+            t.join()
+    
+    def scan(self) -> Dict[str, Dict]:
+        """Lance le scan de tous les hôtes et retourne les résultats par hôte"""
+        print(f"{Colors.CYAN}[*] Démarrage du scan de {len(self.scanners)} hôtes{Colors.RESET}")
+        print(f"{Colors.CYAN}[*] Ports à scanner par hôte: {len(self.ports)}{Colors.RESET}")
+        print(f"{Colors.CYAN}[*] Threads: {self.threads}{Colors.RESET}\n")
+        
+        scan_start_time = time.time()
+        total_probes = len(self.ports) * len(self.scanners)
+        self.transport.set_concurrency(self.threads)
+        self.probes_planned = total_probes
+        display = None
+        if self.progress:
+            display = create_progress_display(
+                self.probe_counts.total, lambda: self.probes_planned,
+                lambda: sum(len(scanner.open_ports) for scanner in self.scanners.values()))
+            display.start()
+        
+        self._run_workers()
+        
+        # Re-sonde les ports filtrés, toujours avec l'ordonnancement équitable
+        # (le filtrage par défaut est évalué hôte par hôte)
+        if display:
+            display.pause()
+        retry_scheduler = create_retry_scheduler()
+        retry_hosts = self._retry_hosts(retry_scheduler)
+        for _, pending in retry_scheduler.rounds(lambda: self._pending_retries(retry_hosts),
+                                                 len(self.ports) * len(retry_hosts)):
+            self.probes_planned += len(pending)
+            if display:
+                display.resume()
+            for host, port in pending:
+                self.scheduler.requeue(host, port)
+            self._run_workers()
+            if display:
+                display.pause()
+        
+        if display:
+            display.stop()
+        
+        if self.postprocessor:
+            records = self.postprocessor.flush()
+            for host, scanner in self.scanners.items():
+                scanner.apply_postprocessing([r for r in records if r['host'] == host])
+        
+        scan_duration = time.time() - scan_start_time
+        log_transport_stats(self.transport.get_stats())
+        
+        return {host: scanner.get_results(scan_duration) for host, scanner in self.scanners.items()}
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Signatures de banners : identification du service à partir du banner reçu
+"""
+
+from typing import Optional
+
+# Mots-clés (en majuscules) recherchés dans le banner, dans l'ordre de priorité
+BANNER_SIGNATURES = [
+    ('SSH', ('SSH',)),
+    ('FTP', ('FTP',)),
+    ('HTTP', ('HTTP', 'APACHE', 'NGINX')),
+    ('SMTP', ('SMTP',)),
+    ('MySQL', ('MYSQL', 'MARIADB')),
+    ('PostgreSQL', ('POSTGRES',)),
+    ('MSSQL', ('MSSQL', 'MICROSOFT')),
+    ('RDP', ('RDP', 'TERMINAL')),
+    ('VNC', ('VNC',)),
+    ('SMB', ('SMB', 'SAMBA')),
+]
+
+def match_service(port: int, banner: str) -> Optional[str]:
+    """
+    Identifie le service annoncé par un banner
+
+    Args:
+        port: Port sur lequel le banner a été reçu
+        banner: Banner décodé
+
+    Returns:
+        Nom du service, ou None si aucune signature ne correspond
+    """
+    if not banner:
+        return None
+
+    banner_upper = banner.upper()
+    for service_name, keywords in BANNER_SIGNATURES:
+        if any(keyword in banner_upper for keyword in keywords):
+            if service_name == 'HTTP' and port == 443:
+                return 'HTTPS'
+            return service_name
+    return None
@@ -0,0 +1,33 @@
+"""
+Module utilitaire commun pour Red Chain
+Contient les classes et fonctions partagées
+
+Les sous-modules sont chargés au premier accès à l'un de leurs noms.
+"""
+
+_LAZY_ATTRIBUTES = {
+    'Colors': 'colors',
+    'setup_logger': 'logger',
+    'get_logger': 'logger',
+    'validate_target': 'validators',
+    'validate_port': 'validators',
+    'validate_ip': 'validators',
+    'validate_domain': 'validators',
+}
+
+__all__ = ['Colors', 'setup_logger', 'get_logger', 'validate_target', 'validate_port', 'validate_ip', 'validate_domain']
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Import relatif via __import__ : évite de charger importlib
+    module = __import__(module_name, globals(), None, [name], 1)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Démon de scan : file de jobs prioritaire et API JSON locale (HTTP ou socket Unix)
+"""
+
+import errno
+import itertools
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import stat
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger('port_scanner')
+
+# États d'un job
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_ERROR = 'error'
+
+
+class TTLCache:
+    """Cache clé/valeur à expiration, partagé entre les jobs du démon"""
+
+    def __init__(self, ttl: float, max_size: int = 1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, max_age: Optional[float] = None):
+        """Retourne la valeur si elle a moins de max_age (défaut: ttl) secondes"""
+        limit = self.ttl if max_age is None else min(max_age, self.ttl)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > limit:
+                return None
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if len(self._data) >= self.max_size and key not in self._data:
+                # Évince l'entrée la plus ancienne
+                oldest = min(self._data, key=lambda k: self._data[k][0])
+                del self._data[oldest]
+            self._data[key] = (time.monotonic(), value)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class ScanJob:
+    """Job de scan soumis au démon ; ses événements peuvent être suivis en continu"""
+
+    def __init__(self, params: Dict, priority: int = 10):
+        self.id = uuid.uuid4().hex[:12]
+        self.params = params
+        self.priority = priority
+        self.status = JOB_QUEUED
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self.events: List[Dict] = []
+        self._cond = threading.Condition()
+
+    def emit(self, event: str, **data):
+        """Ajoute un événement au flux du job"""
+        with self._cond:
+            self.events.append(dict(data, event=event, job_id=self.id))
+            self._cond.notify_all()
+
+    def finish(self, status: str, result: Any = None, error: str = None):
+        with self._cond:
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished_at = time.time()
+            self._cond.notify_all()
+
+    def follow(self, poll: float = 1.0):
+        """Itère sur les événements du job jusqu'à sa fin"""
+        index = 0
+        while True:
+            with self._cond:
+                while index >= len(self.events) and self.status not in (JOB_DONE, JOB_ERROR):
+                    self._cond.wait(timeout=poll)
+                pending = self.events[index:]
+                index = len(self.events)
+                finished = self.status in (JOB_DONE, JOB_ERROR)
+            for event in pending:
+                yield event
+            if finished and index >= len(self.events):
+                return
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        data = {
+            'job_id': self.id,
+            'status': self.status,
+            'priority': self.priority,
+            'params': self.params,
+            'submitted_at': self.submitted_at,
+            'finished_at': self.finished_at,
+        }
+        if self.error:
+            data['error'] = self.error
+        if include_result and self.result is not None:
+            data['result'] = self.result
+        return data
+
+
+class ScanDaemon:
+    """
+    Exécute les jobs de scan par ordre de priorité (plus petit = plus urgent)
+
+    Le processus reste chaud entre les jobs : transport, résolution DNS et
+    résultats récents sont conservés dans des caches partagés.
+    """
+
+    def __init__(self, runner: Callable[['ScanJob', 'ScanDaemon'], Dict], workers: int = 2,
+                 dns_ttl: float = 300.0, result_ttl: float = 60.0, history: int = 256):
+        """
+        Args:
+            runner: Fonction exécutant un job et retournant ses résultats
+            workers: Nombre de jobs exécutés en parallèle
+            dns_ttl: Durée de vie des résolutions DNS en cache (s)
+            result_ttl: Durée de vie maximale des résultats en cache (s)
+            history: Nombre de jobs terminés conservés pour consultation
+        """
+        self.runner = runner
+        self.workers = workers
+        self.history = history
+        self.dns_cache = TTLCache(dns_ttl)
+        self.result_cache = TTLCache(result_ttl)
+        self.jobs: Dict[str, ScanJob] = {}
+        self._queue = queue.PriorityQueue()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._running = False
+        self.started_at = None
+
+    def start(self):
+        """Démarre les workers d'exécution des jobs"""
+        self._running = True
+        self.started_at = time.time()
+        for _ in range(self.workers):
+            t = threading.Thread(target=self._worker, daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self):
+        """Arrête les workers après les jobs en cours"""
+        self._running = False
+        for _ in self._threads:
+            self._queue.put((float('inf'), next(self._counter), None))
+        for t in self._threads:
+            t.join()
+        self._threads = []
+
+    def submit(self, params: Dict, priority: int = 10) -> ScanJob:
+        """Place un job dans la file"""
+        job = ScanJob(params, priority)
+        with self._lock:
+            self.jobs[job.id] = job
+            self._prune()
+        self._queue.put((priority, next(self._counter), job))
+        job.emit('queued', priority=priority)
+        logger.info(f"Job {job.id} en file (priorité {priority}): {params.get('target')}")
+        return job
+
+    def get_job(self, job_id: str) -> Optional[ScanJob]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def _prune(self):
+        """Oublie les jobs terminés les plus anciens au-delà de l'historique"""
+        finished = [j for j in self.jobs.values() if j.status in (JOB_DONE, JOB_ERROR)]
+        excess = len(finished) - self.history
+        if excess > 0:
+            for job in sorted(finished, key=lambda j: j.finished_at)[:excess]:
+                del self.jobs[job.id]
+
+    def _worker(self):
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                break
+            job.status = JOB_RUNNING
+            job.emit('started')
+            try:
+                result = self.runner(job, self)
+            except Exception as e:
+                logger.error(f"Job {job.id} en erreur: {e}")
+                job.emit('error', error=str(e))
+                job.finish(JOB_ERROR, error=str(e))
+            else:
+                job.emit('done', result=result)
+                job.finish(JOB_DONE, result=result)
+
+    def get_status(self) -> Dict:
+        with self._lock:
+            statuses = [j.status for j in self.jobs.values()]
+        return {
+            'uptime': time.time() - self.started_at if self.started_at else 0.0,
+            'queued': statuses.count(JOB_QUEUED),
+            'running': statuses.count(JOB_RUNNING),
+            'done': statuses.count(JOB_DONE),
+            'errors': statuses.count(JOB_ERROR),
+            'dns_cache': len(self.dns_cache),
+            'result_cache': len(self.result_cache),
+        }
+
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    """
+    API JSON du démon
+
+        POST /jobs              soumet un job (flux NDJSON si "stream" vaut true)
+        GET  /jobs              liste les jobs
+        GET  /jobs/<id>         état et résultats d'un job
+        GET  /jobs/<id>/events  suit les événements d'un job (NDJSON)
+        GET  /status            état du démon
+    """
+
+    server_version = 'PortScannerDaemon/1.0'
+
+    @property
+    def daemon(self) -> ScanDaemon:
+        return self.server.scan_daemon
+
+    def log_message(self, format, *args):
+        logger.debug(f"API: {format % args}")
+
+    def _send_json(self, status: int, data: Any):
+        body = json.dumps(data, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, job: ScanJob):
+        """Envoie les événements du job au fil de l'eau, une ligne JSON par événement"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        try:
+            for event in job.follow():
+                self.wfile.write(json.dumps(event, default=str).encode('utf-8') + b'\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            logger.debug(f"Client déconnecté du flux du job {job.id}")
+
+    def do_GET(self):
+        parts = [p for p in self.path.split('?')[0].split('/') if p]
+        if parts == ['status']:
+            self._send_json(200, self.daemon.get_status())
+        elif parts == ['jobs']:
+            with self.daemon._lock:
+                jobs = [j.to_dict(include_result=False) for j in self.daemon.jobs.values()]
+            self._send_json(200, jobs)
+        elif len(parts) in (2, 3) and parts[0] == 'jobs':
+            job = self.daemon.get_job(parts[1])
+            if job is None:
+                self._send_json(404, {'error': f"Job inconnu: {parts[1]}"})
+            elif len(parts) == 3 and parts[2] == 'events':
+                self._stream(job)
+            elif len(parts) == 2:
+                self._send_json(200, job.to_dict())
+            else:
+                self._send_json(404, {'error': 'Ressource inconnue'})
+        else:
+            self._send_json(404, {'error': 'Ressource inconnue'})
+
+    def do_POST(self):
+        if self.path.split('?')[0].rstrip('/') != '/jobs':
+            self._send_json(404, {'error': 'Ressource inconnue'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            params = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(params, dict) or not params.get('target'):
+                raise ValueError("Le champ 'target' est requis")
+            priority = int(params.pop('priority', 10))
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        stream = params.pop('stream', True)
+        job = self.daemon.submit(params, priority)
+        if stream:
+            self._stream(job)
+        else:
+            self._send_json(202, job.to_dict(include_result=False))
+
+
+class DaemonHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class DaemonUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    class _UnixRequestHandler(DaemonRequestHandler):
+        def address_string(self):
+            return 'unix'
+
+
+def remove_stale_socket(path: str):
+    """
+    Supprime un socket Unix laissé par une exécution précédente
+
+    Le socket n'est supprimé que si personne n'y écoute (connexion refusée) :
+    le socket d'un démon en cours d'exécution n'est jamais retiré.
+
+    Raises:
+        FileExistsError: Si le chemin existe mais n'est pas un socket (jamais supprimé)
+        OSError: Si un démon écoute encore sur le socket (EADDRINUSE), ou si
+            son état ne peut pas être vérifié
+    """
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(errno.EEXIST, "le chemin existe et n'est pas un socket Unix", path)
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    probe.settimeout(1.0)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+        return
+    except FileNotFoundError:
+        return
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, "un démon écoute déjà sur ce socket Unix", path)
+
+
+def serve_daemon(daemon: ScanDaemon, host: str = '127.0.0.1', port: int = 8765,
+                 unix_socket: Optional[str] = None):
+    """
+    Démarre le démon et sert l'API jusqu'à interruption
+
+    Args:
+        daemon: Démon à exposer
+        host: Adresse d'écoute HTTP (localhost uniquement recommandé)
+        port: Port d'écoute HTTP
+        unix_socket: Chemin d'un socket Unix à utiliser à la place du HTTP TCP
+    """
+    if unix_socket:
+        remove_stale_socket(unix_socket)
+        server = DaemonUnixServer(unix_socket, _UnixRequestHandler)
+        where = unix_socket
+    else:
+        server = DaemonHTTPServer((host, port), DaemonRequestHandler)
+        where = f"http://{host}:{server.server_address[1]}"
+
+    server.scan_daemon = daemon
+    daemon.start()
+    logger.info(f"Démon de scan à l'écoute sur {where}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        daemon.stop()
+        if unix_socket:
+            remove_stale_socket(unix_socket)
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mode distribué : un coordinateur distribue des lots (hôte, ports) à des workers
+
+Protocole : une ligne JSON par message sur une connexion TCP.
+
+    worker -> coordinateur   {"type": "hello", "worker_id": ...}
+    coordinateur -> worker   {"type": "lease", "chunk_id", "host", "ports", "timeout", "threads"}
+                             {"type": "shutdown"}
+    worker -> coordinateur   {"type": "heartbeat", "chunk_id"}
+                             {"type": "open", "chunk_id", "port", "name", "banner"}
+                             {"type": "done", "chunk_id", "result": {...}}
+                             {"type": "error", "chunk_id", "error"}
+"""
+
+import json
+import logging
+import socket
+import socketserver
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger('port_scanner')
+
+
+def send_message(wfile, message: Dict):
+    """Écrit un message JSON terminé par un saut de ligne"""
+    wfile.write(json.dumps(message).encode('utf-8') + b'\n')
+    wfile.flush()
+
+
+def read_message(rfile) -> Optional[Dict]:
+    """Lit un message JSON, None si la connexion est fermée"""
+    line = rfile.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+class Chunk:
+    """Lot de ports d'un hôte, loué à un worker à la fois"""
+
+    def __init__(self, chunk_id: int, host: str, ports: List[int]):
+        self.id = chunk_id
+        self.host = host
+        self.ports = ports
+        self.worker_id = None
+        self.attempts = 0
+
+
+class Coordinator:
+    """
+    Découpe l'espace (hôte, port) en lots et suit leurs baux
+
+    Les lots sont créés à la demande depuis une position (hôte, décalage) :
+    seuls les lots loués ou remis en file existent en mémoire, quelle que
+    soit la taille de l'espace à scanner. Un lot est remis en file si son
+    worker se déconnecte, reste muet plus de lease_timeout secondes ou le
+    garde plus de lease_max_duration secondes (scan bloqué malgré les
+    battements de cœur), ou signale une erreur de scan. Après max_attempts
+    locations sans succès, le lot est abandonné et ses ports comptés comme
+    non testés : un lot qui fait échouer tous les workers ne bloque pas le
+    scan. Les résultats d'un lot ne sont fusionnés qu'à sa fin, une seule
+    fois, pour ne jamais compter deux fois un port.
+    """
+
+    def __init__(self, hosts: Sequence[str], ports: Sequence[int], chunk_size: int = 256,
+                 timeout: float = 1.0, threads: int = 100, lease_timeout: float = 30.0,
+                 on_open: Callable[[str, int, Dict], None] = None, lease_max_duration: float = 600.0,
+                 max_attempts: int = 3):
+        """
+        Args:
+            hosts: Adresses IP à scanner
+            ports: Ports à sonder sur chaque hôte
+            chunk_size: Nombre de ports par lot
+            timeout: Timeout des sondes transmis aux workers
+            threads: Threads par worker
+            lease_timeout: Silence maximal d'un worker avant reprise de son lot (s)
+            on_open: Appelé à chaque port ouvert signalé (hôte, port, service)
+            lease_max_duration: Durée maximale d'un bail, battements de cœur compris (s)
+            max_attempts: Locations d'un lot avant son abandon
+        """
+        self.timeout = timeout
+        self.threads = threads
+        self.lease_timeout = lease_timeout
+        self.lease_max_duration = lease_max_duration
+        self.max_attempts = max(1, max_attempts)
+        self.on_open = on_open
+        self.hosts = list(hosts)
+        self.ports = ports
+        self.chunk_size = chunk_size
+        self.total_ports = len(ports)
+
+        # Prochain lot à créer : (indice de l'hôte, décalage dans les ports)
+        self._next_host = 0 if ports else len(self.hosts)
+        self._next_offset = 0
+        self._next_id = 0
+        self.total_chunks = len(self.hosts) * -(-len(ports) // chunk_size)
+        self.pending = deque()          # Lots remis en file, prioritaires
+        self.leased: Dict[int, Chunk] = {}
+        self.completed = 0
+
+        self.results = {
+            host: {'open_ports': [], 'services': {}, 'filtered_ports': [], 'unresolved_ports': []}
+            for host in self.hosts
+        }
+        self.workers_seen = set()
+        self.releases = 0
+        self.failed_chunks = 0
+        self.start_time = None
+        self._cond = threading.Condition()
+
+    def is_done(self) -> bool:
+        with self._cond:
+            return self.completed == self.total_chunks
+
+    def _create_chunk(self) -> Optional[Chunk]:
+        """Crée le lot suivant depuis la position courante, None s'il n'en reste pas"""
+        if self._next_host >= len(self.hosts):
+            return None
+        start = self._next_offset
+        chunk = Chunk(self._next_id, self.hosts[self._next_host],
+                      list(self.ports[start:start + self.chunk_size]))
+        self._next_id += 1
+        self._next_offset += self.chunk_size
+        if self._next_offset >= len(self.ports):
+            self._next_host += 1
+            self._next_offset = 0
+        return chunk
+
+    def acquire(self, worker_id: str) -> Optional[Chunk]:
+        """
+        Attribue un lot à un worker, en attendant si tous sont déjà loués
+
+        Returns:
+            Le lot loué, ou None quand tout est terminé
+        """
+        with self._cond:
+            while True:
+                chunk = self.pending.popleft() if self.pending else self._create_chunk()
+                if chunk is not None:
+                    break
+                if self.completed == self.total_chunks:
+                    return None
+                self._cond.wait(timeout=1.0)
+            chunk.worker_id = worker_id
+            chunk.attempts += 1
+            self.leased[chunk.id] = chunk
+            return chunk
+
+    def release(self, chunk: Chunk, reason: str):
+        """Remet un lot en file (worker mort, muet ou en erreur), ou l'abandonne"""
+        with self._cond:
+            if self.leased.pop(chunk.id, None) is None:
+                return
+            chunk.worker_id = None
+            self.releases += 1
+            abandoned = chunk.attempts >= self.max_attempts
+            if abandoned:
+                self.completed += 1
+                self.failed_chunks += 1
+                self.results[chunk.host]['unresolved_ports'].extend(chunk.ports)
+            else:
+                self.pending.appendleft(chunk)
+            self._cond.notify_all()
+        if abandoned:
+            logger.error(f"Lot {chunk.id} ({chunk.host}) abandonné après {chunk.attempts} "
+                         f"tentative(s), {len(chunk.ports)} port(s) non testé(s): {reason}")
+        else:
+            logger.warning(f"Lot {chunk.id} ({chunk.host}) remis en file: {reason}")
+
+    def complete(self, chunk: Chunk, result: Dict):
+        """Fusionne les résultats d'un lot terminé"""
+        with self._cond:
+            # Un lot n'est dans leased qu'entre sa location et sa fin (ou sa reprise)
+            if self.leased.pop(chunk.id, None) is None:
+                return
+            self.completed += 1
+            merged = self.results[chunk.host]
+            merged['open_ports'].extend(result.get('open_ports', []))
+            merged['filtered_ports'].extend(result.get('filtered_ports', []))
+            merged['unresolved_ports'].extend(result.get('unresolved_ports', []))
+            for port, info in result.get('services', {}).items():
+                merged['services'][int(port)] = info
+            self._cond.notify_all()
+
+    def wait(self, poll: float = 1.0) -> Dict[str, Dict]:
+        """Attend la fin de tous les lots et retourne les résultats par hôte"""
+        with self._cond:
+            while self.completed < self.total_chunks:
+                self._cond.wait(timeout=poll)
+        return self.get_results()
+
+    def get_results(self) -> Dict[str, Dict]:
+        """Résultats fusionnés au format de PortScanner.scan()"""
+        duration = time.time() - self.start_time if self.start_time else 0.0
+        with self._cond:
+            return {
+                host: {
+                    'target': host,
+                    'open_ports': sorted(merged['open_ports']),
+                    'filtered_ports': sorted(merged['filtered_ports']),
+                    'services': dict(merged['services']),
+                    'scan_duration': duration,
+                    'total_ports_scanned': self.total_ports,
+                    'unresolved_ports': sorted(merged['unresolved_ports']),
+                    'transport_stats': {'workers': len(self.workers_seen), 'releases': self.releases,
+                                        'failed_chunks': self.failed_chunks},
+                }
+                for host, merged in self.results.items()
+            }
+
+    def get_progress(self) -> Dict:
+        with self._cond:
+            return {
+                'chunks': self.total_chunks,
+                'completed': self.completed,
+                'leased': len(self.leased),
+                'pending': self.total_chunks - self.completed - len(self.leased),
+                'workers': len(self.workers_seen),
+            }
+
+
+class LeaseExpired(Exception):
+    """Un worker a dépassé la durée maximale d'un bail"""
+
+
+class _CoordinatorHandler(socketserver.StreamRequestHandler):
+    """Sert un worker : lui loue des lots tant qu'il en reste"""
+
+    def handle(self):
+        coordinator: Coordinator = self.server.coordinator
+        self.connection.settimeout(coordinator.lease_timeout)
+        chunk = None
+        reason = "connexion terminée"
+        try:
+            hello = read_message(self.rfile)
+            if not hello or hello.get('type') != 'hello':
+                return
+            worker_id = hello.get('worker_id') or f"{self.client_address[0]}:{self.client_address[1]}"
+            with coordinator._cond:
+                coordinator.workers_seen.add(worker_id)
+            logger.info(f"Worker connecté: {worker_id}")
+
+            while True:
+                chunk = coordinator.acquire(worker_id)
+                if chunk is None:
+                    send_message(self.wfile, {'type': 'shutdown'})
+                    return
+                send_message(self.wfile, {
+                    'type': 'lease',
+                    'chunk_id': chunk.id,
+                    'host': chunk.host,
+                    'ports': chunk.ports,
+                    'timeout': coordinator.timeout,
+                    'threads': coordinator.threads,
+                })
+                deadline = time.monotonic() + coordinator.lease_max_duration
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise LeaseExpired("bail expiré (durée maximale dépassée)")
+                    self.connection.settimeout(min(coordinator.lease_timeout, remaining))
+                    try:
+                        message = read_message(self.rfile)
+                    except socket.timeout:
+                        if time.monotonic() >= deadline:
+                            raise LeaseExpired("bail expiré (durée maximale dépassée)")
+                        raise
+                    if message is None:
+                        raise ConnectionError("connexion fermée")
+                    kind = message.get('type')
+                    if kind == 'open' and coordinator.on_open:
+                        coordinator.on_open(chunk.host, message['port'],
+                                            {'name': message.get('name'), 'banner': message.get('banner')})
+                    elif kind == 'done':
+                        coordinator.complete(chunk, message.get('result', {}))
+                        chunk = None
+                        break
+                    elif kind == 'error':
+                        # Le worker reste connecté : il recevra un autre lot
+                        coordinator.release(chunk, f"erreur du worker ({message.get('error')})")
+                        chunk = None
+                        break
+        except socket.timeout:
+            reason = "worker muet (bail expiré)"
+        except LeaseExpired as e:
+            reason = str(e)
+        except (OSError, ValueError, ConnectionError) as e:
+            reason = f"worker perdu ({e})"
+        finally:
+            # Une seule remise en file : une seconde libérerait le lot déjà reloué à un autre worker
+            if chunk is not None:
+                coordinator.release(chunk, reason)
+
+
+class CoordinatorServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, coordinator: Coordinator, host: str = '127.0.0.1', port: int = 8766):
+        self.coordinator = coordinator
+        super().__init__((host, port), _CoordinatorHandler)
+
+
+def run_coordinator(coordinator: Coordinator, host: str = '127.0.0.1', port: int = 8766,
+                    ready: threading.Event = None) -> Dict[str, Dict]:
+    """
+    Sert les workers jusqu'à ce que tous les lots soient terminés
+
+    Args:
+        coordinator: Coordinateur à exposer
+        host: Adresse d'écoute
+        port: Port d'écoute (0 = choisi par le système)
+        ready: Événement signalé une fois le serveur à l'écoute (port réel dans ready.port)
+
+    Returns:
+        Résultats fusionnés par hôte
+    """
+    server = CoordinatorServer(coordinator, host, port)
+    coordinator.start_time = time.time()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    logger.info(f"Coordinateur à l'écoute sur {host}:{server.server_address[1]} "
+                f"({coordinator.total_chunks} lots)")
+    if ready is not None:
+        ready.port = server.server_address[1]
+        ready.set()
+    try:
+        return coordinator.wait()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def run_worker(host: str, port: int, scan_chunk: Callable[..., Dict], worker_id: str = None,
+               heartbeat_interval: float = 5.0, connect_retries: int = 10) -> int:
+    """
+    Connecte un worker au coordinateur et traite les lots jusqu'à l'arrêt
+
+    Args:
+        host: Adresse du coordinateur
+        port: Port du coordinateur
+        scan_chunk: Fonction (host, ports, timeout, threads, on_open) -> résultats
+        worker_id: Identifiant du worker (défaut: aléatoire)
+        heartbeat_interval: Intervalle des battements de cœur pendant un lot (s)
+        connect_retries: Tentatives de connexion (une par seconde)
+
+    Returns:
+        Nombre de lots traités
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{uuid.uuid4().hex[:6]}"
+    for attempt in range(connect_retries):
+        try:
+            conn = socket.create_connection((host, port))
+            break
+        except OSError as e:
+            if attempt == connect_retries - 1:
+                raise
+            logger.debug(f"Coordinateur injoignable ({e}), nouvelle tentative")
+            time.sleep(1.0)
+
+    processed = 0
+    send_lock = threading.Lock()
+    with conn, conn.makefile('rb') as rfile, conn.makefile('wb') as wfile:
+        def send(message: Dict):
+            with send_lock:
+                send_message(wfile, message)
+
+        send({'type': 'hello', 'worker_id': worker_id})
+        logger.info(f"Worker {worker_id} connecté à {host}:{port}")
+
+        while True:
+            message = read_message(rfile)
+            if message is None or message.get('type') == 'shutdown':
+                break
+            if message.get('type') != 'lease':
+                continue
+
+            chunk_id = message['chunk_id']
+            stop = threading.Event()
+
+            def heartbeat():
+                while not stop.wait(heartbeat_interval):
+                    send({'type': 'heartbeat', 'chunk_id': chunk_id})
+
+            beat = threading.Thread(target=heartbeat, daemon=True)
+            beat.start()
+            try:
+                result = scan_chunk(
+                    message['host'], message['ports'], message.get('timeout'), message.get('threads'),
+                    lambda p, info: send(dict(info, type='open', chunk_id=chunk_id, port=p))
+                )
+            except Exception as e:
+                # Le lot est rendu au coordinateur, le worker continue avec le suivant
+                logger.error(f"Échec du lot {chunk_id} ({message['host']}): {e}")
+                send({'type': 'error', 'chunk_id': chunk_id, 'error': f"{type(e).__name__}: {e}"})
+                continue
+            finally:
+                stop.set()
+                beat.join()
+            send({'type': 'done', 'chunk_id': chunk_id, 'result': result})
+            processed += 1
+
+    logger.info(f"Worker {worker_id} terminé ({processed} lot(s))")
+    return processed
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Surveillance continue : ordonnancement des rescans pondéré par le risque
+"""
+
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Poids de rescan par niveau de risque (config.SENSITIVE_PORTS)
+RISK_WEIGHTS = {
+    'CRITICAL': 8.0,
+    'HIGH': 4.0,
+    'MEDIUM': 2.0,
+    'LOW': 1.0,
+}
+
+
+class WatchScheduler:
+    """
+    Choisit à chaque cycle les sondes (hôte, port) les plus utiles dans un
+    budget fixe
+
+    Une sonde redevient due un certain nombre de cycles après son dernier
+    scan : le temps d'un balayage complet divisé par son poids (niveau de
+    risque du port, port actuellement ouvert, hôte ayant changé récemment).
+    Les changements à confirmer passent en premier, puis les sondes dues
+    dans la limite d'une part réservée du budget, puis les sondes jamais
+    effectuées (par risque décroissant), puis le reste des sondes dues : pendant
+    le long balayage initial d'une grande plage, les ports sensibles et les
+    ports ouverts sont donc rescannés à leur rythme. Les sondes sont rangées dans un tas par échéance : le coût d'un cycle dépend du
+    budget, pas du nombre total de couples (hôte, port). Un changement d'état
+    n'est émis qu'après avoir été observé deux fois de suite, pour ne pas
+    alerter sur une simple perte de paquet.
+    """
+
+    # Rangs dans le tas : changement à confirmer, jamais scanné, déjà scanné
+    _PENDING, _NEW, _SCANNED = 0, 1, 2
+
+    def __init__(self, hosts: Sequence[str], ports: Sequence[int], budget: int,
+                 port_risks: Dict[int, str] = None, risk_weights: Dict[str, float] = None,
+                 open_weight: float = 2.0, change_boost: float = 4.0, change_window: float = 600.0,
+                 clock: Callable[[], float] = time.time, rescan_share: float = 0.5):
+        """
+        Args:
+            hosts: Adresses IP surveillées
+            ports: Ports surveillés sur chaque hôte
+            budget: Nombre de sondes par cycle
+            port_risks: Niveau de risque par port ({port: 'HIGH', ...})
+            risk_weights: Poids par niveau de risque (défaut: RISK_WEIGHTS)
+            open_weight: Multiplicateur pour un port actuellement ouvert
+            change_boost: Multiplicateur pour un hôte ayant changé récemment
+            change_window: Durée pendant laquelle un hôte est considéré instable (s)
+            clock: Horloge (remplaçable pour les simulations)
+            rescan_share: Part du budget réservée aux rescans dus, prioritaires
+                sur les sondes jamais effectuées
+        """
+        self.hosts = list(hosts)
+        self.ports = ports
+        self.budget = budget
+        self.port_risks = port_risks or {}
+        self.risk_weights = risk_weights or RISK_WEIGHTS
+        self.open_weight = open_weight
+        self.change_boost = change_boost
+        self.change_window = change_window
+        self.clock = clock
+        self.rescan_share = rescan_share
+
+        self.last_scanned: Dict[Tuple[str, int], float] = {}
+        self.states: Dict[Tuple[str, int], str] = {}
+        self.pending: Dict[Tuple[str, int], str] = {}
+        self.host_changed_at: Dict[str, float] = {}
+        self.cycles = 0
+
+        # Cycles nécessaires pour sonder une fois chaque couple (poids 1)
+        self.sweep_cycles = max(1.0, len(self.hosts) * len(ports) / max(budget, 1))
+        # Sondes jamais effectuées : parcours paresseux, ports les plus risqués d'abord
+        self._new_ports = sorted(ports, key=lambda port: -self.risk_weights.get(self.port_risks.get(port), 1.0))
+        self._new_position = 0
+        # Tas (rang, priorité, numéro, hôte, port) ; une entrée n'est valide que si
+        # son numéro est celui de _entries (les autres sont ignorées au dépilage)
+        self._heap: List[Tuple[int, float, int, str, int]] = []
+        self._entries: Dict[Tuple[str, int], int] = {}
+        self._priorities: Dict[Tuple[str, int], Tuple[int, float]] = {}
+        self._sequence = itertools.count()
+        self.scanned_cycles: Dict[Tuple[str, int], int] = {}
+
+    def weight(self, host: str, port: int, now: float) -> float:
+        """Retourne le poids de rescan d'une sonde"""
+        weight = self.risk_weights.get(self.port_risks.get(port), 1.0)
+        if self.states.get((host, port)) == 'open':
+            weight *= self.open_weight
+        changed_at = self.host_changed_at.get(host)
+        if changed_at is not None and now - changed_at < self.change_window:
+            weight *= self.change_boost
+        return weight
+
+    def _push(self, host: str, port: int, rank: int, priority: float):
+        key = (host, port)
+        sequence = next(self._sequence)
+        self._entries[key] = sequence
+        self._priorities[key] = (rank, priority)
+        heapq.heappush(self._heap, (rank, priority, sequence, host, port))
+
+    def _schedule(self, host: str, port: int, now: float, scanned_cycle: int):
+        """(Re)place une sonde dans le tas selon son état et son poids actuel"""
+        weight = self.weight(host, port, now)
+        if (host, port) in self.pending:
+            self._push(host, port, self._PENDING, -weight)
+        else:
+            self._push(host, port, self._SCANNED, scanned_cycle + self.sweep_cycles / weight)
+
+    def _peek(self) -> Optional[Tuple[int, float]]:
+        """Retourne la priorité de la première entrée valide du tas"""
+        while self._heap:
+            rank, priority, sequence, host, port = self._heap[0]
+            if self._entries.get((host, port)) == sequence:
+                return rank, priority
+            heapq.heappop(self._heap)
+        return None
+
+    def _next_new(self, now: float) -> Optional[Tuple[Tuple[int, float], str, int]]:
+        """Retourne la prochaine sonde jamais effectuée du parcours paresseux"""
+        total = len(self._new_ports) * len(self.hosts)
+        while self._new_position < total:
+            port = self._new_ports[self._new_position // len(self.hosts)]
+            host = self.hosts[self._new_position % len(self.hosts)]
+            if (host, port) not in self._entries and (host, port) not in self.last_scanned:
+                return (self._NEW, -self.weight(host, port, now)), host, port
+            self._new_position += 1
+        return None
+
+    def next_batch(self) -> Dict[str, List[int]]:
+        """
+        Sélectionne les sondes du prochain cycle
+
+        Chaque sonde retournée doit ensuite être passée à record() ou à skip().
+
+        Returns:
+            Ports à sonder par hôte (au plus `budget` sondes au total)
+        """
+        now = self.clock()
+        batch: Dict[str, List[int]] = {}
+        reserved = int(self.budget * self.rescan_share)
+        taken = 0
+
+        # Changements à confirmer, puis rescans échus dans la part réservée
+        while taken < self.budget:
+            queued = self._peek()
+            if queued is None:
+                break
+            rank, due = queued
+            if rank != self._PENDING and (taken >= reserved or due > self.cycles):
+                break
+            self._pop(batch)
+            taken += 1
+
+        # Sondes jamais effectuées, puis le reste du tas par échéance
+        while taken < self.budget:
+            queued = self._peek()
+            new = self._next_new(now)
+            if new is not None and (queued is None or new[0] < queued):
+                _, host, port = new
+                self._new_position += 1
+                batch.setdefault(host, []).append(port)
+            elif queued is not None:
+                self._pop(batch)
+            else:
+                break
+            taken += 1
+        self.cycles += 1
+        if len(self._heap) > 2 * len(self._entries) + self.budget:
+            # Purge des entrées périmées
+            self._heap = [entry for entry in self._heap if self._entries.get(entry[3:]) == entry[2]]
+            heapq.heapify(self._heap)
+        return batch
+
+    def _pop(self, batch: Dict[str, List[int]]):
+        """Ajoute au lot la première entrée du tas (valide après _peek)"""
+        _, _, _, host, port = heapq.heappop(self._heap)
+        del self._entries[(host, port)]
+        batch.setdefault(host, []).append(port)
+
+    def skip(self, host: str, port: int):
+        """Remet en attente une sonde sélectionnée mais non effectuée (sans changer son échéance)"""
+        key = (host, port)
+        if key in self._entries:
+            return
+        rank, priority = self._priorities.get(key, (None, None))
+        if rank is None:
+            # Jamais sondée : reprend sa place parmi les nouvelles sondes
+            self._push(host, port, self._NEW, -self.weight(host, port, self.clock()))
+        else:
+            self._push(host, port, rank, priority)
+
+    def record(self, host: str, port: int, state: str, **details) -> Optional[Dict]:
+        """
+        Enregistre l'état observé d'une sonde
+
+        Args:
+            host: Hôte sondé
+            port: Port sondé
+            state: 'open', 'closed' ou 'filtered'
+            details: Informations ajoutées à l'événement (service, banner...)
+
+        Returns:
+            Événement de changement confirmé, ou None
+        """
+        now = self.clock()
+        key = (host, port)
+        self.last_scanned[key] = now
+        self.scanned_cycles[key] = self.cycles
+        event = self._update_state(host, port, state, now, details)
+        self._schedule(host, port, now, self.cycles)
+        if event and event['old'] is not None:
+            self._reschedule_host(host, now)
+        return event
+
+    def _update_state(self, host: str, port: int, state: str, now: float, details: Dict) -> Optional[Dict]:
+        """Met à jour l'état connu d'une sonde, retourne l'événement de changement confirmé"""
+        key = (host, port)
+        previous = self.states.get(key)
+
+        if previous is None:
+            # Premier passage : état de référence, seuls les ports ouverts sont signalés
+            self.states[key] = state
+            if state == 'open':
+                return dict(details, time=now, host=host, port=port, old=None, new=state,
+                            risk=self.port_risks.get(port))
+            return None
+
+        if state == previous:
+            self.pending.pop(key, None)
+            return None
+
+        if self.pending.get(key) != state:
+            # Première observation du changement : à confirmer au prochain cycle
+            self.pending[key] = state
+            return None
+
+        del self.pending[key]
+        self.states[key] = state
+        self.host_changed_at[host] = now
+        return dict(details, time=now, host=host, port=port, old=previous, new=state,
+                    risk=self.port_risks.get(port))
+
+    def _reschedule_host(self, host: str, now: float):
+        """Avance les échéances des sondes en attente d'un hôte qui vient de changer"""
+        for port in self.ports:
+            key = (host, port)
+            if key in self._entries and key in self.scanned_cycles:
+                self._schedule(host, port, now, self.scanned_cycles[key])
+
+    def get_stats(self) -> Dict:
+        return {
+            'cycles': self.cycles,
+            'tracked': len(self.last_scanned),
+            'open': sum(1 for state in self.states.values() if state == 'open'),
+            'pending': len(self.pending),
+            'unstable_hosts': len(self.host_changed_at),
+        }
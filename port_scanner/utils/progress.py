@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Affichage de la progression d'un scan (sondes, ports ouverts, débit, ETA)
+"""
+
+import logging
+import sys
+import threading
+import time
+from typing import Callable, List, Optional, TextIO
+
+from .colors import Colors
+
+
+class ProbeCounters:
+    """
+    Compteurs de sondes sans verrou : un emplacement par thread worker
+
+    Chaque worker n'incrémente que son propre emplacement, aucune mise à jour
+    ne peut donc être perdue ; l'affichage lit la somme sans se synchroniser
+    (une valeur légèrement en retard suffit).
+    """
+
+    def __init__(self, slots: int):
+        self.slots = [0] * max(slots, 1)
+
+    def total(self) -> int:
+        return sum(self.slots)
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    """Formate une durée restante en H:MM:SS ('--:--:--' si inconnue)"""
+    if seconds is None:
+        return '--:--:--'
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class _ProgressLogHandler(logging.Handler):
+    """Émet les logs via un handler console en effaçant la ligne de progression"""
+
+    def __init__(self, display: 'ProgressDisplay', handler: logging.Handler):
+        super().__init__(handler.level)
+        self.display = display
+        self.handler = handler
+
+    def handle(self, record):
+        return self.display.write_above(lambda: self.handler.handle(record))
+
+
+class ProgressDisplay:
+    """
+    Redessine périodiquement une ligne de progression depuis un thread dédié
+
+    Sur un terminal, la ligne est réécrite sur place à fréquence fixe ; les
+    handlers console du logger donné sont enveloppés pendant l'affichage pour
+    effacer la ligne avant chaque log et la redessiner après, et pause()
+    l'efface le temps que d'autres messages s'affichent.
+    Sinon (sortie redirigée), une ligne simple est écrite sur le flux à
+    intervalle plus long, indépendamment du niveau de log. Le chemin chaud du
+    scan ne fait qu'incrémenter des compteurs : tout le calcul (débit, ETA)
+    est fait ici, à la fréquence d'affichage.
+    """
+
+    def __init__(self, get_done: Callable[[], int], get_total: Callable[[], int],
+                 get_open: Callable[[], int], interval: float = 0.25, log_interval: float = 10.0,
+                 stream: Optional[TextIO] = None, clock: Callable[[], float] = time.monotonic,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            get_done: Retourne le nombre de sondes terminées
+            get_total: Retourne le nombre de sondes prévues (retransmissions comprises)
+            get_open: Retourne le nombre de ports ouverts trouvés
+            interval: Période de rafraîchissement sur un terminal (s)
+            log_interval: Période des lignes de progression hors terminal (s)
+            stream: Flux d'affichage (sys.stdout par défaut)
+            clock: Horloge monotone (remplaçable pour les simulations)
+            logger: Logger dont les logs console ne doivent pas couper la ligne
+        """
+        self.get_done = get_done
+        self.get_total = get_total
+        self.get_open = get_open
+        self.stream = stream or sys.stdout
+        self.clock = clock
+        isatty = getattr(self.stream, 'isatty', None)
+        self.interactive = bool(isatty and isatty())
+        self.interval = interval if self.interactive else log_interval
+
+        self.rate = None
+        self.start_time = None
+        self.last_sample = None
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.lock = threading.Lock()
+        self.paused = False
+        self.logger = logger
+        self.log_handlers: List[_ProgressLogHandler] = []
+
+    def start(self):
+        """Démarre le thread d'affichage"""
+        self.start_time = self.clock()
+        self.last_sample = (self.start_time, self.get_done())
+        if self.interactive and self.logger is not None:
+            self._wrap_log_handlers()
+        self.thread = threading.Thread(target=self._run, name='progress', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Arrête l'affichage après une dernière mise à jour"""
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+        self._unwrap_log_handlers()
+        with self.lock:
+            self.paused = False
+            self._draw()
+            if self.interactive:
+                self.stream.write("\n\n")
+                self.stream.flush()
+
+    def pause(self):
+        """Efface la ligne et suspend l'affichage (avant d'autres messages)"""
+        with self.lock:
+            self.paused = True
+            if self.interactive and self.thread is not None:
+                self.stream.write("\r\033[K")
+                self.stream.flush()
+
+    def resume(self):
+        """Reprend l'affichage après pause()"""
+        with self.lock:
+            self.paused = False
+
+    def write_above(self, emit: Callable[[], object]):
+        """
+        Exécute emit() (écriture d'un message) sans couper la ligne de progression
+
+        La ligne est effacée avant le message puis redessinée dessous, sauf
+        pendant une pause où elle est déjà effacée.
+        """
+        with self.lock:
+            active = self.interactive and self.thread is not None and not self.paused
+            if active:
+                self.stream.write("\r\033[K")
+                self.stream.flush()
+            try:
+                return emit()
+            finally:
+                if active:
+                    self._draw()
+
+    def _wrap_log_handlers(self):
+        """Remplace les handlers console du logger par des enveloppes effaçant la ligne"""
+        for handler in list(self.logger.handlers):
+            if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
+                wrapper = _ProgressLogHandler(self, handler)
+                self.logger.removeHandler(handler)
+                self.logger.addHandler(wrapper)
+                self.log_handlers.append(wrapper)
+
+    def _unwrap_log_handlers(self):
+        """Réinstalle les handlers console d'origine"""
+        for wrapper in self.log_handlers:
+            self.logger.removeHandler(wrapper)
+            self.logger.addHandler(wrapper.handler)
+        self.log_handlers = []
+
+    def __enter__(self) -> 'ProgressDisplay':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def update(self):
+        """Échantillonne les compteurs et met à jour le débit lissé"""
+        now = self.clock()
+        done = self.get_done()
+        last_time, last_done = self.last_sample
+        if now > last_time:
+            instant = (done - last_done) / (now - last_time)
+            # Moyenne mobile exponentielle : stable sans masquer un ralentissement
+            self.rate = instant if self.rate is None else 0.3 * instant + 0.7 * self.rate
+        self.last_sample = (now, done)
+
+    def eta(self) -> Optional[float]:
+        """Retourne le temps restant estimé en secondes, ou None"""
+        if not self.rate:
+            return None
+        remaining = max(self.get_total() - self.last_sample[1], 0)
+        return remaining / self.rate
+
+    def render(self) -> str:
+        """Construit la ligne de progression (sans couleurs)"""
+        done = self.last_sample[1]
+        total = max(self.get_total(), 1)
+        percent = min(100.0, 100.0 * done / total)
+        rate = self.rate or 0.0
+        return (f"{done}/{total} sondes ({percent:5.1f}%) | {self.get_open()} ouverts | "
+                f"{rate:.0f} sondes/s | ETA {format_eta(self.eta())}")
+
+    def _draw(self):
+        if self.interactive:
+            self.stream.write(f"\r{Colors.CYAN}[*] {self.render()}{Colors.RESET}\033[K")
+        else:
+            self.stream.write(f"[*] Progression: {self.render()}\n")
+        self.stream.flush()
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            self.update()
+            with self.lock:
+                if not self.paused:
+                    self._draw()
+        self.update()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gestion des ressources socket (descripteurs de fichiers et ports éphémères)
+"""
+
+import errno
+import socket
+import struct
+import threading
+from typing import Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Erreurs indiquant un manque de ressources locales et non un port fermé
+RESOURCE_ERRNOS = frozenset(
+    code for code in (
+        getattr(errno, 'EADDRNOTAVAIL', None),
+        getattr(errno, 'EADDRINUSE', None),
+        getattr(errno, 'EMFILE', None),
+        getattr(errno, 'ENFILE', None),
+        getattr(errno, 'ENOBUFS', None),
+        getattr(errno, 'ENOMEM', None),
+    ) if code is not None
+)
+# EAGAIN n'en fait pas partie : connect_ex le retourne aussi en cas de timeout
+
+# SO_LINGER actif avec un délai nul : close() envoie un RST et évite TIME_WAIT
+LINGER_ZERO = struct.pack('ii', 1, 0)
+
+DEFAULT_EPHEMERAL_RANGE = (32768, 60999)
+
+
+def is_resource_error(code: int) -> bool:
+    """
+    Indique si un code d'erreur correspond à un épuisement de ressources locales
+
+    Args:
+        code: Code errno retourné par connect_ex ou porté par une OSError
+
+    Returns:
+        True si l'erreur doit être réessayée plutôt que comptée comme port fermé
+    """
+    return code in RESOURCE_ERRNOS
+
+
+def get_fd_limit() -> Optional[int]:
+    """
+    Retourne la limite souple RLIMIT_NOFILE du processus
+
+    Returns:
+        Nombre maximal de descripteurs ouverts, ou None si inconnu
+    """
+    if resource is None:
+        return None
+    try:
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (ValueError, OSError):
+        return None
+    if soft == resource.RLIM_INFINITY:
+        return None
+    return soft
+
+
+def get_ephemeral_port_range(path: str = '/proc/sys/net/ipv4/ip_local_port_range') -> Tuple[int, int]:
+    """
+    Lit la plage de ports éphémères du noyau
+
+    Args:
+        path: Fichier sysctl à lire
+
+    Returns:
+        Tuple (premier port, dernier port)
+    """
+    try:
+        with open(path, 'r') as f:
+            low, high = (int(value) for value in f.read().split()[:2])
+        if 0 < low <= high:
+            return low, high
+    except (OSError, ValueError):
+        pass
+    return DEFAULT_EPHEMERAL_RANGE
+
+
+class SocketResourceManager:
+    """
+    Limite le nombre de sockets simultanés en fonction des descripteurs et des
+    ports éphémères disponibles, et ferme les sockets sans passer par TIME_WAIT
+    """
+
+    def __init__(self, fd_reserve: int = 64, ephemeral_ratio: float = 0.8,
+                 linger_zero: bool = True, max_sockets: Optional[int] = None):
+        """
+        Args:
+            fd_reserve: Descripteurs laissés libres pour les logs, fichiers, etc.
+            ephemeral_ratio: Part maximale de la plage éphémère utilisable
+            linger_zero: Ferme les sockets avec SO_LINGER(0)
+            max_sockets: Plafond explicite (optionnel)
+        """
+        self.linger_zero = linger_zero
+        self.fd_limit = get_fd_limit()
+        self.ephemeral_range = get_ephemeral_port_range()
+
+        low, high = self.ephemeral_range
+        limits = [max(1, int((high - low + 1) * ephemeral_ratio))]
+        if self.fd_limit is not None:
+            limits.append(max(1, self.fd_limit - fd_reserve))
+        if max_sockets:
+            limits.append(max_sockets)
+
+        self.capacity = min(limits)
+        self.limit = self.capacity
+        self.in_use = 0
+        self.peak = 0
+        self.exhaustion_events = 0
+        self.decreases = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Attend qu'un emplacement soit disponible sous la limite courante"""
+        with self._cond:
+            while self.in_use >= self.limit:
+                self._cond.wait()
+            self.in_use += 1
+            if self.in_use > self.peak:
+                self.peak = self.in_use
+
+    def release(self):
+        """Libère un emplacement"""
+        with self._cond:
+            self.in_use -= 1
+            self._cond.notify()
+
+    def report_exhaustion(self, epoch: Optional[int] = None):
+        """
+        Réduit la limite de moitié après une erreur de ressources
+
+        Comme pour le contrôle de congestion TCP, la limite n'est réduite
+        qu'une fois par fenêtre : les erreurs des sondes lancées avant la
+        dernière réduction reflètent l'ancienne charge et sont seulement
+        comptées (sans quoi des échecs simultanés feraient tomber la limite à 1).
+
+        Args:
+            epoch: Valeur de `decreases` relevée au lancement de la sonde
+        """
+        with self._cond:
+            self.exhaustion_events += 1
+            if epoch is not None and epoch != self.decreases:
+                return
+            self.decreases += 1
+            self.limit = max(1, min(self.limit, self.in_use) // 2)
+
+    def report_success(self):
+        """Remonte la limite d'un emplacement par succès (démarrage lent)"""
+        if self.limit >= self.capacity:
+            return
+        with self._cond:
+            if self.limit < self.capacity:
+                self.limit += 1
+                self._cond.notify()
+
+    def open_socket(self, timeout: float,
+                    family: int = socket.AF_INET) -> socket.socket:
+        """
+        Réserve un emplacement et crée un socket TCP
+
+        Args:
+            timeout: Timeout du socket en secondes
+            family: Famille d'adresses
+
+        Returns:
+            Socket prêt à être connecté (à fermer avec close_socket)
+
+        Raises:
+            OSError: Si la création échoue (l'emplacement est alors libéré)
+        """
+        self.acquire()
+        try:
+            sock = socket.socket(family, socket.SOCK_STREAM)
+        except OSError:
+            self.release()
+            raise
+        sock.settimeout(timeout)
+        if self.linger_zero:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, LINGER_ZERO)
+            except OSError:
+                pass
+        return sock
+
+    def close_socket(self, sock: Optional[socket.socket]):
+        """Ferme un socket ouvert par open_socket et libère son emplacement"""
+        if sock is None:
+            return
+        try:
+            sock.close()
+        except OSError:
+            pass
+        finally:
+            self.release()
+
+    def get_stats(self) -> dict:
+        """Retourne l'état courant du gestionnaire"""
+        return {
+            'capacity': self.capacity,
+            'limit': self.limit,
+            'in_use': self.in_use,
+            'peak': self.peak,
+            'exhaustion_events': self.exhaustion_events,
+            'decreases': self.decreases,
+            'fd_limit': self.fd_limit,
+            'ephemeral_range': self.ephemeral_range,
+        }
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ordonnanceur de retransmissions pour les ports filtrés
+"""
+
+import logging
+import time
+from typing import Callable, Collection, Iterator, Tuple
+
+logger = logging.getLogger('port_scanner')
+
+
+class RetryScheduler:
+    """
+    Regroupe les nouvelles sondes des ports filtrés en tours exécutés après
+    le balayage principal, avec un délai exponentiel entre les tours
+
+    Seuls les ports sans réponse sont re-sondés : un RST (port fermé) est une
+    réponse définitive, un silence peut venir d'une simple perte de paquet.
+    """
+
+    def __init__(self, max_retries: int = 2, base_delay: float = 0.5, backoff: float = 2.0,
+                 max_filtered_ratio: float = 0.5, sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            max_retries: Nombre maximal de tours de retransmission
+            base_delay: Attente avant le premier tour en secondes
+            backoff: Facteur multiplicatif de l'attente entre deux tours
+            max_filtered_ratio: Au-delà de cette proportion de ports filtrés,
+                l'hôte filtre par défaut et les retransmissions sont inutiles
+            sleep: Fonction d'attente (remplaçable pour les simulations)
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.backoff = backoff
+        self.max_filtered_ratio = max_filtered_ratio
+        self.sleep = sleep
+        self.rounds_done = 0
+        self.probes_sent = 0
+
+    def delay(self, attempt: int) -> float:
+        """Retourne l'attente avant le tour de retransmission donné (à partir de 1)"""
+        return self.base_delay * self.backoff ** (attempt - 1)
+
+    def is_default_drop(self, filtered: int, total: int) -> bool:
+        """Indique si la proportion de sondes filtrées révèle un filtrage par défaut"""
+        return bool(total) and filtered / total > self.max_filtered_ratio
+
+    def rounds(self, get_pending: Callable[[], Collection], total: int) -> Iterator[Tuple[int, list]]:
+        """
+        Génère les tours de retransmission
+
+        Args:
+            get_pending: Retourne les éléments encore filtrés (réévalué à chaque tour)
+            total: Nombre total d'éléments sondés lors du balayage principal
+
+        Yields:
+            Tuple (numéro du tour, éléments à re-sonder)
+        """
+        for attempt in range(1, self.max_retries + 1):
+            pending = sorted(get_pending())
+            if not pending:
+                return
+
+            if attempt == 1 and self.is_default_drop(len(pending), total):
+                logger.info(f"{len(pending)}/{total} sondes filtrées : filtrage par défaut, "
+                            f"pas de retransmission")
+                return
+
+            delay = self.delay(attempt)
+            logger.info(f"Retransmission {attempt}/{self.max_retries}: "
+                        f"{len(pending)} sonde(s) filtrée(s) dans {delay:.2f}s")
+            self.sleep(delay)
+            self.rounds_done += 1
+            self.probes_sent += len(pending)
+            yield attempt, pending
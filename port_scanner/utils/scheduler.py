@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ordonnanceur équitable multi-hôtes avec plafonds de politesse par hôte
+"""
+
+import heapq
+import math
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class PortPermutation:
+    """
+    Permutation pseudo-aléatoire d'une séquence de ports, calculée à la volée
+
+    Utilise une bijection affine i -> (a * i + c) mod n avec a premier avec n :
+    aucune liste permutée n'est construite en mémoire.
+    """
+
+    def __init__(self, ports: Sequence[int], seed: Optional[int] = None):
+        self.ports = ports
+        self.size = len(ports)
+        rng = random.Random(seed)
+        if self.size > 1:
+            self.multiplier = rng.randrange(1, self.size)
+            while math.gcd(self.multiplier, self.size) != 1:
+                self.multiplier = rng.randrange(1, self.size)
+            self.offset = rng.randrange(self.size)
+        else:
+            self.multiplier, self.offset = 1, 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        return self.ports[(self.multiplier * index + self.offset) % self.size]
+
+
+class HostState:
+    """État d'ordonnancement d'un hôte"""
+
+    def __init__(self, host: str, permutation: PortPermutation, max_in_flight: int,
+                 min_in_flight: int, rate_limit: Optional[float]):
+        self.host = host
+        self.permutation = permutation
+        self.position = 0
+        self.retries = deque()
+        self.queued = False
+        self.in_flight = 0
+        self.max_in_flight = max_in_flight
+        self.min_in_flight = min_in_flight
+        self.limit = max_in_flight
+        self.rate_limit = rate_limit
+        self.tokens = 1.0
+        self.last_refill = None
+        self.srtt = None
+        self.completed = 0
+        self.timeouts = 0
+        self.borrowed = 0
+
+    def has_work(self) -> bool:
+        return bool(self.retries) or self.position < len(self.permutation)
+
+    def token_delay(self, now: float) -> float:
+        """Met à jour le seau de jetons et retourne l'attente avant la prochaine sonde"""
+        if self.rate_limit is None:
+            return 0.0
+        if self.last_refill is not None:
+            self.tokens = min(1.0, self.tokens + (now - self.last_refill) * self.rate_limit)
+        self.last_refill = now
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate_limit
+
+    def take(self) -> int:
+        """Retire le prochain port à sonder (les reprises passent en premier)"""
+        if self.rate_limit is not None:
+            self.tokens -= 1.0
+        self.in_flight += 1
+        if self.retries:
+            return self.retries.popleft()
+        port = self.permutation[self.position]
+        self.position += 1
+        return port
+
+
+class FairScheduler:
+    """
+    Distribue les sondes (hôte, port) en round-robin entre les hôtes
+
+    Chaque hôte a un plafond de sondes simultanées et un débit maximal. Le
+    plafond s'adapte : il diminue de moitié quand les sondes d'un hôte
+    expirent et remonte d'une unité par réponse, jusqu'à sa part normale.
+    Quand tous les hôtes sont à leur plafond et qu'un thread resterait
+    inactif, la sonde est prêtée à l'hôte le plus réactif (temps de réponse
+    lissé dans la moitié la plus rapide, sans expiration récente), jusqu'au
+    plafond de politesse absolu : la capacité rendue par les hôtes lents
+    profite ainsi aux hôtes réactifs.
+
+    Seuls les hôtes ayant encore des ports à sonder sont dans l'anneau du
+    round-robin : un hôte en sort dès qu'il n'a plus de travail et y revient
+    lorsqu'un port lui est rendu. Le seuil de réactivité (médiane des temps
+    de réponse) est recalculé après un nombre de sondes égal au nombre
+    d'hôtes actifs, et non à chaque prêt.
+    """
+
+    def __init__(self, hosts: List[str], ports: Sequence[int], max_in_flight_per_host: int = 32,
+                 rate_per_host: Optional[float] = None, seed: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic, burst_ceiling: Optional[int] = None):
+        """
+        Args:
+            hosts: Adresses des hôtes à scanner
+            ports: Ports à sonder sur chaque hôte (partagés, jamais dupliqués)
+            max_in_flight_per_host: Part normale de sondes simultanées par hôte
+            rate_per_host: Sondes par seconde maximales par hôte (None = illimité)
+            seed: Graine des permutations de ports
+            clock: Horloge utilisée pour la limitation de débit
+            burst_ceiling: Plafond absolu par hôte en empruntant la capacité
+                inutilisée (défaut: max_in_flight_per_host, sans emprunt)
+        """
+        self.clock = clock
+        self.burst_ceiling = max(burst_ceiling or 0, max_in_flight_per_host)
+        min_in_flight = max(1, max_in_flight_per_host // 4)
+        self.hosts: Dict[str, HostState] = {}
+        for index, host in enumerate(hosts):
+            host_seed = None if seed is None else seed + index
+            self.hosts[host] = HostState(host, PortPermutation(ports, host_seed),
+                                         max_in_flight_per_host, min_in_flight, rate_per_host)
+        self._ring = deque()
+        for state in self.hosts.values():
+            self._enqueue(state)
+        self._in_flight = 0
+        self._deferred = []  # Tas (échéance, hôte, port) des reprises différées
+        self._fast_threshold = None
+        self._since_ranking = 0
+        self._cond = threading.Condition()
+
+    def _enqueue(self, state: HostState):
+        """Replace un hôte ayant du travail dans l'anneau du round-robin"""
+        if not state.queued and state.has_work():
+            state.queued = True
+            self._ring.append(state)
+
+    def next_probe(self) -> Optional[Tuple[str, int]]:
+        """
+        Retourne la prochaine sonde à effectuer, en attendant si tous les hôtes
+        sont à leur plafond
+
+        Returns:
+            Tuple (hôte, port), ou None quand tout le travail est terminé
+        """
+        with self._cond:
+            while True:
+                now = self.clock()
+                wait_for = self._release_deferred(now)
+                ring = self._ring
+                threshold = self._ranking_threshold()
+                borrower = None
+                for _ in range(len(ring)):
+                    state = ring[0]
+                    if not state.has_work():
+                        ring.popleft()
+                        state.queued = False
+                        continue
+                    ring.rotate(-1)
+                    if state.in_flight >= state.limit and not self._can_borrow(state, threshold):
+                        continue
+                    delay = state.token_delay(now)
+                    if delay > 0:
+                        wait_for = delay if wait_for is None else min(wait_for, delay)
+                    elif state.in_flight < state.limit:
+                        return self._take(state)
+                    elif borrower is None or state.srtt < borrower.srtt:
+                        borrower = state
+
+                if borrower is not None:
+                    borrower.borrowed += 1
+                    return self._take(borrower)
+                if not ring and not self._in_flight and not self._deferred:
+                    self._cond.notify_all()
+                    return None
+
+                self._cond.wait(timeout=wait_for)
+
+    def _take(self, state: HostState) -> Tuple[str, int]:
+        self._in_flight += 1
+        return state.host, state.take()
+
+    def _ranking_threshold(self) -> Optional[float]:
+        """
+        Retourne le temps de réponse lissé médian des hôtes actifs
+
+        Recalculé au plus une fois par tour d'anneau de sondes terminées : le
+        tri coûte O(n log n), soit O(log n) amorti par sonde.
+        """
+        if self._fast_threshold is None or self._since_ranking >= len(self._ring):
+            srtts = sorted(state.srtt for state in self._ring if state.srtt is not None)
+            self._fast_threshold = srtts[(len(srtts) - 1) // 2] if srtts else None
+            self._since_ranking = 0
+        return self._fast_threshold
+
+    def _can_borrow(self, state: HostState, threshold: Optional[float]) -> bool:
+        """Indique si un hôte à son plafond peut recevoir une sonde au-delà de sa part"""
+        return (threshold is not None and state.srtt is not None and state.srtt <= threshold
+                and state.limit >= state.max_in_flight and state.in_flight < self.burst_ceiling)
+
+    def _release_deferred(self, now: float) -> Optional[float]:
+        """
+        Replace en file les reprises différées arrivées à échéance
+
+        Returns:
+            Attente avant la prochaine échéance, ou None s'il n'y en a plus
+        """
+        while self._deferred and self._deferred[0][0] <= now:
+            _, host, port = heapq.heappop(self._deferred)
+            state = self.hosts[host]
+            state.retries.append(port)
+            self._enqueue(state)
+        return self._deferred[0][0] - now if self._deferred else None
+
+    def complete(self, host: str, elapsed: float, timed_out: bool):
+        """
+        Signale la fin d'une sonde et ajuste le plafond de l'hôte
+
+        Args:
+            host: Hôte sondé
+            elapsed: Durée de la sonde en secondes
+            timed_out: True si la sonde a expiré sans réponse
+        """
+        with self._cond:
+            state = self.hosts[host]
+            state.in_flight -= 1
+            state.completed += 1
+            self._in_flight -= 1
+            self._since_ranking += 1
+            if timed_out:
+                state.timeouts += 1
+                state.limit = max(state.min_in_flight, state.limit // 2)
+            else:
+                state.srtt = elapsed if state.srtt is None else 0.875 * state.srtt + 0.125 * elapsed
+                if state.limit < state.max_in_flight:
+                    state.limit += 1
+            self._cond.notify_all()
+
+    def requeue(self, host: str, port: int, delay: float = 0.0):
+        """
+        Replace un port dans la file de l'hôte, prioritaire sur la permutation
+
+        Pendant un scan, doit être appelé avant complete() pour la sonde en
+        cours ; après la fin du scan, réactive l'hôte pour un nouveau tour.
+
+        Args:
+            host: Hôte du port
+            port: Port à sonder de nouveau
+            delay: Attente avant que le port redevienne disponible (s) ; aucun
+                thread n'est bloqué pendant ce délai
+        """
+        with self._cond:
+            state = self.hosts[host]
+            if delay > 0:
+                heapq.heappush(self._deferred, (self.clock() + delay, host, port))
+            else:
+                state.retries.append(port)
+                self._enqueue(state)
+            self._cond.notify_all()
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Retourne les statistiques par hôte"""
+        with self._cond:
+            return {
+                host: {
+                    'completed': state.completed,
+                    'timeouts': state.timeouts,
+                    'limit': state.limit,
+                    'srtt': state.srtt,
+                    'borrowed': state.borrowed,
+                }
+                for host, state in self.hosts.items()
+            }
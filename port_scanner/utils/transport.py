@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Couche de transport des sondes TCP : sockets réels ou réseau simulé en mémoire
+"""
+
+import errno
+import heapq
+import math
+import os
+import socket
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from .resources import SocketResourceManager, is_resource_error
+
+# Codes retournés par Transport.connect
+OPEN = 0
+CLOSED = errno.ECONNREFUSED
+FILTERED = errno.ETIMEDOUT
+
+# États d'un port après une sonde
+PORT_OPEN = 'open'
+PORT_CLOSED = 'closed'
+PORT_FILTERED = 'filtered'
+
+# Codes que connect_ex retourne lorsque le timeout expire
+_TIMEOUT_ERRNOS = frozenset((errno.EAGAIN, errno.EWOULDBLOCK, errno.EINPROGRESS, errno.ETIMEDOUT))
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(value: int) -> int:
+    """Fonction de mélange splitmix64 : hachage entier rapide et bien réparti"""
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def classify_result(code: int) -> str:
+    """
+    Convertit le code d'une sonde en état de port
+
+    Args:
+        code: Code retourné par Transport.connect (hors erreurs de ressources)
+
+    Returns:
+        PORT_OPEN, PORT_CLOSED (RST reçu) ou PORT_FILTERED (silence, ICMP injoignable...)
+    """
+    if code == OPEN:
+        return PORT_OPEN
+    if code == CLOSED:
+        return PORT_CLOSED
+    return PORT_FILTERED
+
+
+class Transport:
+    """Interface commune des transports utilisés par les moteurs de scan"""
+
+    def connect(self, host: str, port: int, timeout: float) -> int:
+        """
+        Tente une connexion TCP complète puis la referme
+
+        Args:
+            host: Adresse IP cible
+            port: Port cible
+            timeout: Timeout en secondes
+
+        Returns:
+            0 si ouvert, ECONNREFUSED si fermé, ETIMEDOUT si filtré,
+            ou un autre code errno (ressources locales, hôte injoignable, ...)
+        """
+        raise NotImplementedError
+
+    def grab_banner(self, host: str, port: int, timeout: float,
+                    read_timeout: float = 2.0) -> Optional[str]:
+        """
+        Se connecte et lit le banner envoyé par le service
+
+        Returns:
+            Banner décodé (éventuellement vide), ou None si la connexion échoue
+        """
+        raise NotImplementedError
+
+    def set_concurrency(self, senders: int):
+        """Indique le nombre de threads qui vont sonder en parallèle"""
+        pass
+
+    def get_stats(self) -> Dict:
+        """Retourne les statistiques du transport"""
+        return {}
+
+    def close(self):
+        """Libère les ressources du transport"""
+        pass
+
+
+class SocketTransport(Transport):
+    """Transport basé sur de vrais sockets, encadré par un SocketResourceManager"""
+
+    def __init__(self, resources: Optional[SocketResourceManager] = None):
+        self.resources = resources or SocketResourceManager()
+
+    def connect(self, host: str, port: int, timeout: float) -> int:
+        sock = None
+        epoch = self.resources.decreases
+        try:
+            sock = self.resources.open_socket(timeout)
+            result = sock.connect_ex((host, port))
+        except socket.timeout:
+            result = FILTERED
+        except OSError as e:
+            result = e.errno if e.errno is not None else FILTERED
+        finally:
+            self.resources.close_socket(sock)
+
+        if result in _TIMEOUT_ERRNOS:
+            result = FILTERED
+
+        if is_resource_error(result):
+            self.resources.report_exhaustion(epoch)
+        else:
+            self.resources.report_success()
+        return result
+
+    def grab_banner(self, host: str, port: int, timeout: float,
+                    read_timeout: float = 2.0) -> Optional[str]:
+        sock = None
+        try:
+            sock = self.resources.open_socket(timeout)
+            if sock.connect_ex((host, port)) != 0:
+                return None
+            sock.settimeout(read_timeout)
+            try:
+                return sock.recv(1024).decode('utf-8', errors='ignore').strip()
+            except socket.timeout:
+                return ''
+        finally:
+            self.resources.close_socket(sock)
+
+    def get_stats(self) -> Dict:
+        return self.resources.get_stats()
+
+
+class SimulatedHost:
+    """Description d'un hôte du réseau simulé"""
+
+    def __init__(self, ports: Optional[Dict[int, int]] = None, default: int = CLOSED,
+                 latency: float = 0.01, jitter: float = 0.0, loss: float = 0.0,
+                 rate_limit: Optional[float] = None, rate_burst: Optional[int] = None,
+                 rate_limit_result: int = FILTERED, banners: Optional[Dict[int, str]] = None):
+        """
+        Args:
+            ports: États explicites {port: OPEN | CLOSED | FILTERED}
+            default: État des ports non listés
+            latency: Latence moyenne d'une réponse en secondes
+            jitter: Écart-type de la latence (distribution gaussienne tronquée à 0)
+            loss: Probabilité qu'une sonde ou sa réponse soit perdue
+            rate_limit: Sondes par seconde tolérées par l'hôte (None = illimité)
+            rate_burst: Taille du seau de jetons (défaut: rate_limit)
+            rate_limit_result: Réponse aux sondes excédentaires (FILTERED = drop, CLOSED = RST)
+            banners: Banners renvoyés par les ports ouverts
+        """
+        self.ports = dict(ports or {})
+        self.default = default
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst if rate_burst is not None else (rate_limit or 0)
+        self.rate_limit_result = rate_limit_result
+        self.banners = dict(banners or {})
+        self._tokens = float(self.rate_burst)
+        self._last_refill = None
+
+    @classmethod
+    def with_open_ports(cls, open_ports: Iterable[int], **kwargs) -> 'SimulatedHost':
+        """Crée un hôte dont seuls les ports donnés sont ouverts"""
+        return cls(ports={port: OPEN for port in open_ports}, **kwargs)
+
+    def state(self, port: int) -> int:
+        """Retourne l'état réel d'un port, hors perte et limitation"""
+        return self.ports.get(port, self.default)
+
+    def take_token(self, now: float) -> bool:
+        """Consomme un jeton du limiteur de débit, False si le seau est vide"""
+        if self.rate_limit is None:
+            return True
+        if self._last_refill is None:
+            self._last_refill = now
+        self._tokens = min(self.rate_burst, self._tokens + (now - self._last_refill) * self.rate_limit)
+        self._last_refill = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+
+class SimulatedTransport(Transport):
+    """
+    Réseau simulé en mémoire, déterministe pour une graine donnée
+
+    Pertes et latences sont tirées d'un hachage entier de (graine, hôte, port,
+    tentative) et non d'un flux aléatoire partagé : le résultat de chaque
+    sonde ne dépend pas de l'ordre d'arrivée des threads.
+
+    En mode non temps réel (défaut), aucune attente n'est effectuée : les
+    ordonnanceurs peuvent être testés à des millions de sondes par seconde.
+    Le temps est alors simulé par événements discrets : chaque émetteur
+    concurrent (un par thread du scan, voir set_concurrency) est une voie
+    occupée jusqu'à la réponse ou au timeout de sa sonde, et la sonde
+    suivante part sur la première voie libérée. L'horloge partagée avance
+    ainsi au rythme de sondes simultanées, comme sur un vrai réseau, et les
+    limiteurs de débit voient le débit réel d'envoi. En mode temps réel,
+    chaque sonde dort pendant la latence tirée (ou le timeout pour un port
+    filtré) et les limiteurs suivent l'horloge réelle.
+    """
+
+    def __init__(self, hosts: Optional[Dict[str, SimulatedHost]] = None, seed: Optional[int] = None,
+                 realtime: bool = False, unknown_host_result: int = errno.EHOSTUNREACH,
+                 clock: Optional[Callable[[], float]] = None, concurrency: Optional[int] = None,
+                 max_tracked_attempts: int = 100000):
+        """
+        Args:
+            hosts: Hôtes simulés indexés par adresse IP
+            seed: Graine des tirages (pertes, latences)
+            realtime: Dort réellement pendant les latences simulées
+            unknown_host_result: Code retourné pour un hôte absent
+            clock: Horloge des limiteurs de débit (défaut: time.monotonic en
+                temps réel, horloge simulée par événements discrets sinon)
+            concurrency: Sondes simultanées simulées (défaut: nombre de
+                threads annoncé par le scanner, une seule voie sinon)
+            max_tracked_attempts: Nombre maximal de sondes perdues dont la
+                tentative suivante est suivie (les plus anciennes sont oubliées)
+        """
+        self.hosts = dict(hosts or {})
+        self.realtime = realtime
+        self.unknown_host_result = unknown_host_result
+        self.clock = clock if clock is not None else (time.monotonic if realtime else None)
+        self.seed = seed if seed is not None else int.from_bytes(os.urandom(8), 'big')
+        self.max_tracked_attempts = max_tracked_attempts
+        self._lock = threading.Lock()
+        self._host_keys = {}
+        self._attempts = {}
+        self.concurrency = concurrency
+        self._lanes = [0.0] * (concurrency or 1)
+        self.now = 0.0
+        self.probes = 0
+        self.dropped = 0
+        self.rate_limited = 0
+        self.simulated_time = 0.0
+
+    def add_host(self, address: str, host: SimulatedHost):
+        """Ajoute ou remplace un hôte simulé"""
+        with self._lock:
+            self.hosts[address] = host
+
+    def _host_key(self, host: str) -> int:
+        """Clé de hachage stable d'un hôte (indépendante de PYTHONHASHSEED)"""
+        key = self._host_keys.get(host)
+        if key is None:
+            key = self.seed & _MASK64
+            data = host.encode()
+            for i in range(0, len(data), 8):
+                key = _mix64(key ^ int.from_bytes(data[i:i + 8], 'little'))
+            self._host_keys[host] = key
+        return key
+
+    def _draw(self, host: str, port: int, attempt: int) -> int:
+        """Tirage 64 bits propre à une tentative, indépendant de l'ordre des sondes"""
+        return _mix64((self._host_key(host) + port * 0x9E3779B97F4A7C15
+                       + attempt * 0xD1B54A32D192ED03) & _MASK64)
+
+    def set_concurrency(self, senders: int):
+        """Ajuste le nombre de voies d'émission simulées (sauf `concurrency` fixé)"""
+        if self.concurrency:
+            return
+        with self._lock:
+            while len(self._lanes) < senders:
+                heapq.heappush(self._lanes, self.now)
+            if len(self._lanes) > senders:
+                # Les voies occupées le plus longtemps disparaissent en premier
+                self._lanes = sorted(self._lanes)[:max(senders, 1)]
+
+    def _send_time(self) -> float:
+        """Retire la première voie d'émission libre et retourne sa date (horloge simulée)"""
+        self.now = heapq.heappop(self._lanes)
+        return self.now
+
+    def _probe(self, host: str, port: int, timeout: float) -> Tuple[int, float]:
+        """Calcule le résultat d'une sonde et sa durée simulée"""
+        with self._lock:
+            self.probes += 1
+            sim_host = self.hosts.get(host)
+            if sim_host is None:
+                return self.unknown_host_result, 0.0
+
+            now = self.clock() if self.clock else self._send_time()
+            key = (host, port)
+            attempt = self._attempts.get(key, 0)
+            draw = self._draw(host, port, attempt) if sim_host.loss or sim_host.jitter else 0
+
+            if not sim_host.take_token(now):
+                self.rate_limited += 1
+                result = sim_host.rate_limit_result
+            elif sim_host.loss and (draw >> 11) * 2.0 ** -53 < sim_host.loss:
+                self.dropped += 1
+                result = FILTERED
+            else:
+                result = sim_host.state(port)
+
+            if result == FILTERED:
+                delay = timeout
+            else:
+                delay = sim_host.latency
+                if sim_host.jitter:
+                    # Box-Muller sur un second tirage dérivé du premier
+                    bits = _mix64(draw)
+                    u1 = ((bits >> 32) + 1) * 2.0 ** -32
+                    u2 = (bits & 0xFFFFFFFF) * 2.0 ** -32
+                    delay += sim_host.jitter * math.sqrt(-2.0 * math.log(u1)) * math.cos(2.0 * math.pi * u2)
+                delay = max(0.0, delay)
+                if delay > timeout:
+                    # Réponse arrivée après le timeout : vue comme filtrée
+                    result, delay = FILTERED, timeout
+
+            # Seules les sondes sans réponse seront retentées : leur tentative
+            # suivante doit faire un nouveau tirage
+            if result == FILTERED:
+                self._attempts.pop(key, None)
+                if len(self._attempts) >= self.max_tracked_attempts:
+                    del self._attempts[next(iter(self._attempts))]
+                self._attempts[key] = attempt + 1
+            elif attempt:
+                del self._attempts[key]
+
+            self.simulated_time += delay
+            if not self.clock:
+                heapq.heappush(self._lanes, now + delay)
+        return result, delay
+
+    def connect(self, host: str, port: int, timeout: float) -> int:
+        result, delay = self._probe(host, port, timeout)
+        if self.realtime and delay:
+            time.sleep(delay)
+        return result
+
+    def grab_banner(self, host: str, port: int, timeout: float,
+                    read_timeout: float = 2.0) -> Optional[str]:
+        if self.connect(host, port, timeout) != OPEN:
+            return None
+        return self.hosts[host].banners.get(port, '')
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'probes': self.probes,
+                'dropped': self.dropped,
+                'rate_limited': self.rate_limited,
+                'simulated_time': self.simulated_time,
+                'elapsed': self.now,
+            }
@@ -7,7 +7,6 @@ Validateurs pour les entrées utilisateur
 import re
 import socket
 from typing import Optional, List
-from ipaddress import ip_address, ip_network, AddressValueError
 
 class ValidationError(Exception):
     """Exception levée lors d'une erreur de validation"""
@@ -23,6 +22,9 @@ def validate_ip(ip: str) -> bool:
     Returns:
         True si valide, False sinon
     """
+    # Import différé : ipaddress n'est chargé qu'à la première validation
+    from ipaddress import ip_address, AddressValueError
+    
     try:
         ip_address(ip)
         return True
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Scan distribué en local : un coordinateur et plusieurs workers sur un réseau simulé
+"""
+
+import threading
+import unittest
+
+from port_scanner.cli import create_chunk_scanner
+from port_scanner.utils.distributed import Coordinator, run_coordinator, run_worker
+from port_scanner.utils.transport import SimulatedHost, SimulatedTransport
+
+HOSTS = {
+    '10.0.0.1': SimulatedHost.with_open_ports([22, 80, 443, 1500]),
+    '10.0.0.2': SimulatedHost.with_open_ports([25, 1433]),
+}
+PORTS = list(range(1, 2001))
+
+
+def start_coordinator(coordinator: Coordinator):
+    """Lance le coordinateur dans un thread et retourne (thread, résultats, port)"""
+    ready = threading.Event()
+    results = {}
+    thread = threading.Thread(
+        target=lambda: results.update(run_coordinator(coordinator, '127.0.0.1', 0, ready)),
+        daemon=True)
+    thread.start()
+    ready.wait(5.0)
+    return thread, results, ready.port
+
+
+class WorkerThread(threading.Thread):
+    """Worker local ; processed contient le nombre de lots traités à sa fin"""
+
+    def __init__(self, port: int, scan_chunk, worker_id: str):
+        super().__init__(daemon=True)
+        self.port = port
+        self.scan_chunk = scan_chunk
+        self.worker_id = worker_id
+        self.processed = None
+
+    def run(self):
+        self.processed = run_worker('127.0.0.1', self.port, self.scan_chunk, worker_id=self.worker_id,
+                                    heartbeat_interval=0.1)
+
+
+def start_workers(port: int, scan_chunks: list) -> list:
+    """Lance un worker par fonction de scan"""
+    workers = [WorkerThread(port, scan_chunk, f"worker-{index}")
+               for index, scan_chunk in enumerate(scan_chunks)]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+class DistributedScanTest(unittest.TestCase):
+
+    def test_workers_share_chunks(self):
+        coordinator = Coordinator(list(HOSTS), PORTS, chunk_size=256, timeout=0.5, threads=8)
+        thread, results, port = start_coordinator(coordinator)
+        workers = start_workers(port, [create_chunk_scanner(SimulatedTransport(HOSTS, seed=i))
+                                       for i in range(2)])
+
+        thread.join(30.0)
+        for worker in workers:
+            worker.join(5.0)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(results['10.0.0.1']['open_ports'], [22, 80, 443, 1500])
+        self.assertEqual(results['10.0.0.2']['open_ports'], [25, 1433])
+        self.assertEqual(results['10.0.0.1']['unresolved_ports'], [])
+        self.assertEqual(sum(worker.processed for worker in workers), coordinator.total_chunks)
+        self.assertEqual(len(coordinator.workers_seen), 2)
+
+    def test_failing_chunk_is_abandoned_and_workers_survive(self):
+        def poisoned(scan_chunk):
+            def scan(host, ports, timeout, threads, on_open):
+                if host == '10.0.0.1' and 1500 in ports:
+                    raise RuntimeError("lot empoisonné")
+                return scan_chunk(host, ports, timeout, threads, on_open)
+            return scan
+
+        coordinator = Coordinator(list(HOSTS), PORTS, chunk_size=256, timeout=0.5, threads=8,
+                                  max_attempts=3)
+        thread, results, port = start_coordinator(coordinator)
+        workers = start_workers(port, [poisoned(create_chunk_scanner(SimulatedTransport(HOSTS, seed=i)))
+                                       for i in range(2)])
+
+        thread.join(30.0)
+        for worker in workers:
+            worker.join(5.0)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(coordinator.failed_chunks, 1)
+        self.assertEqual(results['10.0.0.1']['open_ports'], [22, 80, 443])
+        self.assertEqual(results['10.0.0.1']['unresolved_ports'], list(range(1281, 1537)))
+        self.assertEqual(results['10.0.0.2']['open_ports'], [25, 1433])
+        # Les deux workers ont survécu à l'échec et ont reçu l'ordre d'arrêt
+        self.assertEqual(sum(worker.processed for worker in workers), coordinator.total_chunks - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Surveillance continue : rescans pondérés pendant le balayage initial
+"""
+
+import unittest
+
+from port_scanner.utils.monitor import WatchScheduler
+
+HOSTS = [f"10.0.0.{i}" for i in range(1, 11)]
+PORTS = list(range(1, 10001))
+
+
+def run_cycles(scheduler: WatchScheduler, cycles: int, open_probes: set) -> dict:
+    """Exécute des cycles simulés et retourne {(hôte, port): [cycles où la sonde a été faite]}"""
+    scanned = {}
+    for _ in range(cycles):
+        cycle = scheduler.cycles
+        for host, ports in scheduler.next_batch().items():
+            for port in ports:
+                scanned.setdefault((host, port), []).append(cycle)
+                scheduler.record(host, port, 'open' if (host, port) in open_probes else 'closed')
+    return scanned
+
+
+class WatchSchedulerTest(unittest.TestCase):
+
+    def test_high_risk_open_port_rescanned_during_initial_sweep(self):
+        scheduler = WatchScheduler(HOSTS, PORTS, budget=500, port_risks={22: 'HIGH'})
+        scanned = run_cycles(scheduler, 60, {('10.0.0.1', 22)})
+
+        # Balayage initial : 100 000 sondes à 500 par cycle, loin d'être terminé
+        self.assertLess(len(scanned), len(HOSTS) * len(PORTS))
+        # Poids 4 (HIGH) x 2 (ouvert) : dû tous les 200 / 8 = 25 cycles
+        cycles = scanned[('10.0.0.1', 22)]
+        self.assertEqual(cycles[0], 0)
+        self.assertGreaterEqual(len(cycles), 3)
+        for previous, current in zip(cycles, cycles[1:]):
+            self.assertLessEqual(current - previous, 26)
+
+    def test_budget_and_initial_sweep_progress(self):
+        scheduler = WatchScheduler(HOSTS, PORTS, budget=500, port_risks={22: 'HIGH', 23: 'CRITICAL'})
+        batch = scheduler.next_batch()
+        self.assertEqual(sum(len(ports) for ports in batch.values()), 500)
+        # Ports les plus risqués d'abord
+        self.assertEqual(batch['10.0.0.1'][:2], [23, 22])
+        for host, ports in batch.items():
+            for port in ports:
+                scheduler.record(host, port, 'closed')
+
+        # Sans rescan échu, tout le budget sert à poursuivre le balayage
+        scanned = run_cycles(scheduler, 10, set())
+        self.assertEqual(len(scanned), 10 * 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
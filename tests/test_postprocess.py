@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Post-traitement : plugins exécutés dans le thread de répartition ou dans un pool spawn
+"""
+
+import os
+import unittest
+
+from port_scanner.postprocess import AnalysisPlugin, PostProcessor, ServiceFingerprintPlugin
+
+
+class PidPlugin(AnalysisPlugin):
+    """Note le processus qui a exécuté le plugin"""
+
+    name = 'pid'
+    cpu_bound = True
+
+    def process(self, record):
+        return {'pid': os.getpid(), 'length': len(record['banner'])}
+
+
+class FailingPlugin(AnalysisPlugin):
+    name = 'failing'
+
+    def process(self, record):
+        raise ValueError("plugin en échec")
+
+
+RECORDS = [
+    {'host': '10.0.0.1', 'port': 22, 'service': 'SSH', 'banner': 'SSH-2.0-OpenSSH_9.6'},
+    {'host': '10.0.0.1', 'port': 8080, 'service': 'HTTP-Proxy', 'banner': 'HTTP/1.1 200 OK nginx'},
+    {'host': '10.0.0.2', 'port': 3306, 'service': 'MySQL', 'banner': ''},
+]
+
+
+class PostProcessorTest(unittest.TestCase):
+
+    def test_default_runs_cheap_plugins_in_thread(self):
+        self.assertEqual(PostProcessor(plugins=[ServiceFingerprintPlugin()]).workers, 0)
+        self.assertGreater(PostProcessor(plugins=[ServiceFingerprintPlugin(), PidPlugin()]).workers, 0)
+
+    def test_spawn_pool_returns_results(self):
+        with PostProcessor(plugins=[ServiceFingerprintPlugin(), PidPlugin(), FailingPlugin()],
+                           workers=2, batch_size=2, batch_timeout=0.05) as postprocessor:
+            for record in RECORDS * 10:
+                postprocessor.submit(dict(record))
+            host_records = postprocessor.flush('10.0.0.2')
+            records = postprocessor.flush()
+
+        self.assertEqual(len(host_records), 10)
+        self.assertEqual(len(records), 20)
+        by_port = {record['port']: record['plugins'] for record in records + host_records}
+        self.assertEqual(by_port[22]['fingerprint'], {'service': 'SSH'})
+        self.assertEqual(by_port[8080]['fingerprint'], {'service': 'HTTP'})
+        self.assertNotIn('fingerprint', by_port[3306])
+        self.assertEqual(by_port[22]['pid']['length'], len(RECORDS[0]['banner']))
+        self.assertNotEqual(by_port[22]['pid']['pid'], os.getpid())
+        self.assertIn('ValueError', by_port[22]['failing']['error'])
+        self.assertEqual(postprocessor.stats['records'], 30)
+        self.assertEqual(postprocessor.stats['plugin_errors'], 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ligne de progression : logs affichés sans couper la ligne, affichage sur demande
+"""
+
+import io
+import logging
+import unittest
+
+from port_scanner.scanner import PortScanner
+from port_scanner.utils.progress import ProgressDisplay
+from port_scanner.utils.transport import SimulatedHost, SimulatedTransport
+
+
+class TtyStream(io.StringIO):
+    def isatty(self):
+        return True
+
+
+class ProgressDisplayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.stream = TtyStream()
+        self.logger = logging.getLogger('port_scanner.tests.progress')
+        self.logger.propagate = False
+        self.handler = logging.StreamHandler(self.stream)
+        self.handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        self.logger.addHandler(self.handler)
+        self.addCleanup(self.logger.removeHandler, self.handler)
+
+    def test_log_records_clear_and_redraw_line(self):
+        display = ProgressDisplay(lambda: 5, lambda: 10, lambda: 1, interval=60.0,
+                                  stream=self.stream, logger=self.logger)
+        display.start()
+        self.logger.warning("ressources saturées")
+        display.stop()
+
+        output = self.stream.getvalue()
+        # Ligne effacée, message sur sa propre ligne, puis ligne redessinée dessous
+        self.assertIn("\r\033[KWARNING ressources saturées\n\r", output)
+        # Handlers d'origine réinstallés à l'arrêt
+        self.assertIn(self.handler, self.logger.handlers)
+        self.assertEqual(display.log_handlers, [])
+
+    def test_paused_display_is_not_redrawn(self):
+        display = ProgressDisplay(lambda: 5, lambda: 10, lambda: 1, interval=60.0,
+                                  stream=self.stream, logger=self.logger)
+        display.start()
+        display.pause()
+        before = self.stream.getvalue()
+        self.logger.warning("retransmission")
+        self.assertEqual(self.stream.getvalue(), before + "WARNING retransmission\n")
+        display.stop()
+
+    def test_library_scanner_has_no_display_by_default(self):
+        transport = SimulatedTransport({'10.0.0.1': SimulatedHost.with_open_ports([22])}, seed=1)
+        scanner = PortScanner('10.0.0.1', ports=[22, 80], threads=2, transport=transport, verbose=False)
+        self.assertFalse(scanner.progress)
+
+
+if __name__ == '__main__':
+    unittest.main()
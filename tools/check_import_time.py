@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vérifie le budget de temps d'import du paquet avec `python -X importtime`
+
+Usage:
+    python tools/check_import_time.py            # budgets par défaut
+    python tools/check_import_time.py --runs 10
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+# Instruction d'import -> (budget du paquet, budget total) en millisecondes.
+# Le premier porte sur le temps propre des modules port_scanner.* ; le second
+# sur tout ce que l'import charge en plus du démarrage de l'interpréteur,
+# modules standard compris (logging, socket, typing...) : c'est le coût réel
+# payé par un utilisateur qui n'a encore rien importé.
+BUDGETS = {
+    'import port_scanner': (1.0, 2.0),
+    'from port_scanner import PortScanner': (5.0, 50.0),
+    'from port_scanner import ReportGenerator': (5.0, 30.0),
+}
+
+PACKAGE = 'port_scanner'
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(statement: str) -> Tuple[float, float]:
+    """
+    Mesure le temps d'import d'une instruction
+
+    Returns:
+        Tuple (temps propre des modules du paquet, temps total des modules
+        chargés en plus de ceux du démarrage de l'interpréteur), en ms
+    """
+    baseline = set(_parse_importtime('pass'))
+    own_us = total_us = 0
+    for name, (self_us, _) in _parse_importtime(statement).items():
+        if name in baseline:
+            continue
+        total_us += self_us
+        if name == PACKAGE or name.startswith(PACKAGE + '.'):
+            own_us += self_us
+    return own_us / 1000.0, total_us / 1000.0
+
+
+def _parse_importtime(statement: str) -> Dict[str, Tuple[int, int]]:
+    """Retourne {module: (temps propre, temps cumulé)} en microsecondes"""
+    # Bytecode autorisé : on mesure un import à chaud, pas la compilation
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        self_us = int(fields[0].rsplit(':', 1)[1])
+        modules[fields[2].strip()] = (self_us, int(fields[1]))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vérifie le budget de temps d'import")
+    parser.add_argument('--runs', type=int, default=5, help='Mesures par instruction (minimum retenu)')
+    args = parser.parse_args()
+
+    failed = False
+    for statement, (own_budget, total_budget) in BUDGETS.items():
+        measure(statement)  # Écrit le bytecode avant les mesures
+        runs = [measure(statement) for _ in range(args.runs)]
+        own = min(own for own, _ in runs)
+        total = min(total for _, total in runs)
+        exceeded = own > own_budget or total > total_budget
+        status = 'DÉPASSÉ' if exceeded else 'OK'
+        failed |= exceeded
+        print(f"{status:8s} paquet {own:5.1f} ms / {own_budget:4.1f} ms  "
+              f"total {total:5.1f} ms / {total_budget:4.1f} ms  {statement}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +0,0 @@
-"""
-Module utilitaire commun pour Red Chain
-Contient les classes et fonctions partagées
-"""
-
-from .colors import Colors
-from .logger import setup_logger, get_logger
-from .validators import validate_target, validate_port, validate_ip, validate_domain
-
-__all__ = ['Colors', 'setup_logger', 'get_logger', 'validate_target', 'validate_port', 'validate_ip', 'validate_domain']